@@ -0,0 +1,104 @@
+"""
+End-to-end hotkey latency benchmark
+Drives SelectionKeyboardHook against the in-memory clipboard backend, so the
+whole press -> copy -> transform -> paste path can be measured on a headless
+box, and reports p50/p99 hotkey-to-paste latency per selection size and
+simulated application copy latency
+
+    python benchmarks/bench_hotkey.py
+    python benchmarks/bench_hotkey.py --sizes 100,10K,1M --latencies 0,0.01,0.2 --presses 50
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_transform import ASCII_WORDS, make_corpus, parse_size
+from clipboard_backend import MemoryClipboardBackend
+from config_manager import TransformSettings
+from selection_keyboard import SelectionKeyboardHook
+from text_processor import SelectionUwuTextProcessor
+from timing_profiles import TimingProfiles
+
+DEFAULT_SIZES = '100,10K,100K,1M'
+DEFAULT_LATENCIES = '0,0.01,0.1'
+
+def percentile(samples: list, fraction: float) -> float:
+    """Nearest-rank percentile of a list of samples"""
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+def bench_case(size: int, latency: float, presses: int, timeout: float, profiles) -> dict:
+    """Press the hotkey repeatedly and time each press until the paste lands"""
+    processor = SelectionUwuTextProcessor()
+    processor.apply_settings(TransformSettings(yu=True, stutter=True))
+    app = f'app-{latency}'
+    backend = MemoryClipboardBackend(selection=make_corpus(ASCII_WORDS, size), app=app,
+                                     app_latencies={app: latency})
+    hook = SelectionKeyboardHook(processor, clipboard_timeout=max(timeout, latency * 4),
+                                 timing_profiles=profiles, clipboard_backend=backend)
+    hook.dispatcher.start()  # No real hotkey registration; presses come from trigger()
+
+    samples = []
+    failures = 0
+    try:
+        for _ in range(presses):
+            backend.paste_event.clear()
+            start = time.perf_counter()
+            hook.trigger()
+            if not backend.paste_event.wait(timeout + latency * 8):
+                failures += 1
+                continue
+            samples.append(time.perf_counter() - start)
+            # Let the job finish its bookkeeping before the next press
+            while hook.metrics()['pending_jobs']:
+                time.sleep(0.0005)
+    finally:
+        hook.stop()
+        processor.shutdown()
+
+    result = {'size': size, 'latency': latency, 'presses': presses, 'failures': failures}
+    if samples:
+        result.update(p50=percentile(samples, 0.50), p99=percentile(samples, 0.99), max=max(samples))
+    return result
+
+def main(argv=None) -> int:
+    """Run the hotkey latency benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help=f"selection sizes (default: {DEFAULT_SIZES})")
+    parser.add_argument('--latencies', default=DEFAULT_LATENCIES,
+                        help=f"simulated app copy latencies in seconds (default: {DEFAULT_LATENCIES})")
+    parser.add_argument('--presses', type=int, default=30, help="hotkey presses per case")
+    parser.add_argument('--timeout', type=float, default=0.6, help="clipboard timeout given to the hook")
+    parser.add_argument('--profiles', action='store_true', help="let per-app timing profiles adapt during the run")
+    args = parser.parse_args(argv)
+
+    # Profiles live in a scratch directory so benchmarks never touch the user's own
+    profiles = None
+    if args.profiles:
+        profiles = TimingProfiles(tempfile.mkdtemp())
+
+    # The hook logs every press; keep the report readable
+    real_stdout = sys.stdout
+    print(f"{'size':>10} {'app latency':>12} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9} {'failed':>7}")
+    for size in (parse_size(size) for size in args.sizes.split(',')):
+        for latency in (float(latency) for latency in args.latencies.split(',')):
+            sys.stdout = open(os.devnull, 'w', encoding='utf-8')
+            try:
+                result = bench_case(size, latency, args.presses, args.timeout, profiles)
+            finally:
+                sys.stdout.close()
+                sys.stdout = real_stdout
+            if 'p50' in result:
+                print(f"{size:>10} {latency * 1000:>10.1f}ms {result['p50'] * 1000:9.2f} "
+                      f"{result['p99'] * 1000:9.2f} {result['max'] * 1000:9.2f} {result['failures']:>7}")
+            else:
+                print(f"{size:>10} {latency * 1000:>10.1f}ms {'-':>9} {'-':>9} {'-':>9} {result['failures']:>7}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
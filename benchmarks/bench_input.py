@@ -0,0 +1,67 @@
+"""
+Input backend latency benchmark
+Registers a hotkey on each input backend, sends it as synthetic keystrokes
+and reports the time from key event to hotkey callback, plus the per-event
+overhead each backend's hook adds to all typing. Needs a desktop session
+(and root for the keyboard library on Linux):
+
+    python benchmarks/bench_input.py --backends keyboard,pynput --presses 200
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from input_backend import INPUT_BACKENDS
+
+DEFAULT_HOTKEY = 'ctrl+alt+shift+f12'
+
+def bench_backend(name: str, hotkey: str, presses: int) -> dict:
+    """Press the hotkey synthetically and collect the backend's latency stats"""
+    backend = INPUT_BACKENDS[name](measure_events=True)
+    fired = threading.Event()
+    handle = backend.add_hotkey(hotkey, fired.set)
+    missed = 0
+    try:
+        for _ in range(presses):
+            fired.clear()
+            backend.press_and_release(hotkey)
+            if not fired.wait(1):
+                missed += 1
+            # Let the release events through before the next press
+            time.sleep(0.01)
+    finally:
+        backend.remove_hotkey(handle)
+        backend.stop()
+    result = backend.stats.metrics()
+    result['missed'] = missed
+    return result
+
+def main(argv=None) -> int:
+    """Run the input backend comparison"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--backends', default=','.join(INPUT_BACKENDS), help="backends to compare")
+    parser.add_argument('--hotkey', default=DEFAULT_HOTKEY, help=f"hotkey to send (default: {DEFAULT_HOTKEY})")
+    parser.add_argument('--presses', type=int, default=100, help="hotkey presses per backend")
+    args = parser.parse_args(argv)
+
+    def ms(value) -> str:
+        return f"{value:9.3f}" if value is not None else f"{'-':>9}"
+
+    print(f"{'backend':>10} {'disp p50':>9} {'disp p99':>9} {'evt p50':>9} {'evt p99':>9} {'events':>7} {'missed':>7}")
+    for name in args.backends.split(','):
+        try:
+            result = bench_backend(name, args.hotkey, args.presses)
+        except Exception as e:
+            print(f"{name:>10} unavailable: {e}")
+            continue
+        print(f"{name:>10} {ms(result['input_dispatch_p50_ms'])} {ms(result['input_dispatch_p99_ms'])} "
+              f"{ms(result['input_event_overhead_p50_ms'])} {ms(result['input_event_overhead_p99_ms'])} "
+              f"{result['input_events_measured']:>7} {result['missed']:>7}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+"""
+PRIMARY selection vs ctrl+c latency benchmark (Linux/X11)
+Runs the real hook against a Qt text editor with highlighted text and compares
+hotkey-to-paste latency when the selection is read from PRIMARY with the
+synthetic copy round-trip through CLIPBOARD. Needs an X server, e.g. Xvfb:
+
+    xvfb-run -a python benchmarks/bench_primary.py --sizes 100,10K,1M --presses 30
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtCore import QObject, Qt, pyqtSignal
+from PyQt5.QtGui import QClipboard
+from PyQt5.QtWidgets import QApplication, QPlainTextEdit
+from bench_hotkey import percentile
+from bench_transform import ASCII_WORDS, make_corpus, parse_size
+from clipboard_backend import ClipboardBackend
+from clipboard_wait import ClipboardChangeNotifier
+from config_manager import TransformSettings
+from primary_selection import PrimarySelectionSource
+from selection_keyboard import SelectionKeyboardHook
+from text_processor import SelectionUwuTextProcessor
+
+DEFAULT_SIZES = '100,10K,100K'
+
+class GuiInvoker(QObject):
+    """Runs callables on the GUI thread and waits for them"""
+    call = pyqtSignal(object)
+
+    def __init__(self):
+        super().__init__()
+        self.call.connect(self._run, Qt.BlockingQueuedConnection)
+
+    def _run(self, function):
+        function()
+
+    def __call__(self, function):
+        result = []
+        self.call.emit(lambda: result.append(function()))
+        return result[0] if result else None
+
+class EditorClipboardBackend(ClipboardBackend):
+    """X11 CLIPBOARD through QClipboard, with copy/paste sent to a Qt editor instead of keystrokes"""
+
+    name = 'qt-editor'
+
+    def __init__(self, editor: QPlainTextEdit, invoke: GuiInvoker, notifier: ClipboardChangeNotifier):
+        super().__init__()
+        self.editor = editor
+        self.invoke = invoke
+        self.notifier = notifier
+        self.paste_event = threading.Event()
+        self._clipboard = QApplication.clipboard()
+
+    def paste(self) -> str:
+        return self.invoke(lambda: self._clipboard.text(QClipboard.Clipboard))
+
+    def copy(self, text: str):
+        self.invoke(lambda: self._clipboard.setText(text, QClipboard.Clipboard))
+
+    def change_count(self) -> int:
+        return self.notifier.changes
+
+    def send_copy(self):
+        self.invoke(self.editor.copy)
+
+    def send_paste(self):
+        def paste():
+            self.editor.paste()
+            self.paste_event.set()
+        self.invoke(paste)
+
+    def is_pressed(self, key: str) -> bool:
+        return False
+
+def bench_path(hook, backend, invoke, editor, text: str, presses: int) -> list:
+    """Highlight text in the editor, press the hotkey and time each paste"""
+    samples = []
+    for _ in range(presses):
+        def highlight():
+            editor.setPlainText(text)
+            editor.selectAll()  # Publishes PRIMARY on X11
+        invoke(highlight)
+        # Let the debounced PRIMARY refresh happen, as it would while the user moves to the hotkey
+        time.sleep(0.05)
+        backend.paste_event.clear()
+        start = time.perf_counter()
+        hook.trigger()
+        if backend.paste_event.wait(5):
+            samples.append(time.perf_counter() - start)
+        while hook.metrics()['pending_jobs']:
+            time.sleep(0.0005)
+    return samples
+
+def run(app, invoke: GuiInvoker, args):
+    """Benchmark thread: both paths for every size, then quit the app"""
+    editor = invoke(lambda: QPlainTextEdit())
+    invoke(editor.show)
+    notifier = ClipboardChangeNotifier()
+    invoke(lambda: QApplication.clipboard().dataChanged.connect(notifier.notify))
+    source = invoke(lambda: PrimarySelectionSource())
+    if not source.available:
+        print("This platform has no PRIMARY selection (run under X11 or Xvfb)")
+
+    processor = SelectionUwuTextProcessor()
+    processor.apply_settings(TransformSettings(yu=True, stutter=True))
+    print(f"{'size':>10} {'path':>8} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9} {'ok':>5}")
+    try:
+        for size in (parse_size(size) for size in args.sizes.split(',')):
+            text = make_corpus(ASCII_WORDS, size)
+            for label, selection_source in (('ctrl+c', None), ('primary', source)):
+                backend = EditorClipboardBackend(editor, invoke, notifier)
+                hook = SelectionKeyboardHook(processor, clipboard_notifier=notifier, clipboard_backend=backend,
+                                             selection_source=selection_source)
+                hook.dispatcher.start()
+                real_stdout, sys.stdout = sys.stdout, open(os.devnull, 'w', encoding='utf-8')
+                try:
+                    samples = bench_path(hook, backend, invoke, editor, text, args.presses)
+                finally:
+                    hook.stop()
+                    sys.stdout.close()
+                    sys.stdout = real_stdout
+                if samples:
+                    print(f"{size:>10} {label:>8} {percentile(samples, 0.5) * 1000:9.2f} "
+                          f"{percentile(samples, 0.99) * 1000:9.2f} {max(samples) * 1000:9.2f} "
+                          f"{len(samples):>5}")
+                else:
+                    print(f"{size:>10} {label:>8} {'-':>9} {'-':>9} {'-':>9} {0:>5}")
+    finally:
+        processor.shutdown()
+        invoke(app.quit)
+
+def main(argv=None) -> int:
+    """Run the PRIMARY vs ctrl+c comparison"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help=f"selection sizes (default: {DEFAULT_SIZES})")
+    parser.add_argument('--presses', type=int, default=20, help="hotkey presses per case")
+    args = parser.parse_args(argv)
+
+    app = QApplication(sys.argv[:1])
+    invoke = GuiInvoker()  # Created here so its slot runs on the GUI thread
+    worker = threading.Thread(target=run, args=(app, invoke, args), daemon=True)
+    worker.start()
+    app.exec_()
+    worker.join(5)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
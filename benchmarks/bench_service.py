@@ -0,0 +1,78 @@
+"""
+Throughput benchmark for the local uwu service
+Starts an in-process service (or uses a running one with --address) and
+measures sequential and pipelined request rates
+
+    python benchmarks/bench_service.py --requests 5000 --size 200
+"""
+import argparse
+import os
+import socket
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config_manager import TransformSettings
+from text_processor import SelectionUwuTextProcessor
+from uwu_service import UwuClient, UwuService
+
+SAMPLE = "Hello there, lovely user! Are you ready for your transformation? "
+
+def measure(label: str, requests: int, run) -> float:
+    """Time run() and print the request rate"""
+    start = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - start
+    rate = requests / elapsed
+    print(f"{label:<28} {requests:>7} requests  {elapsed:8.3f}s  {rate:10.0f} req/s  "
+          f"{elapsed / requests * 1e6:8.1f} µs/req")
+    return rate
+
+def main(argv=None) -> int:
+    """Run the service benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--address', help="benchmark an already running service instead of an in-process one")
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--size', type=int, default=200, help="characters per request")
+    parser.add_argument('--window', type=int, default=64, help="pipelining depth")
+    args = parser.parse_args(argv)
+
+    text = (SAMPLE * (args.size // len(SAMPLE) + 1))[:args.size]
+    texts = [text] * args.requests
+
+    service = None
+    address = args.address
+    if address is None:
+        processor = SelectionUwuTextProcessor()
+        processor.apply_settings(TransformSettings(yu=True, stutter=True))
+        if hasattr(socket, 'AF_UNIX'):
+            address = os.path.join(tempfile.mkdtemp(), 'bench.sock')
+        else:
+            address = '127.0.0.1:0'
+        service = UwuService(processor, address)
+        service.start()
+        if not isinstance(service.address, str) and service.server:
+            address = '%s:%d' % service.server.sockets[0].getsockname()[:2]
+
+    try:
+        with UwuClient(address) as client:
+            client.uwuify(text)  # Warm up the connection and pipelines
+            measure("sequential (keep-alive)", args.requests, lambda: [client.uwuify(t) for t in texts])
+            measure(f"pipelined (window {args.window})", args.requests,
+                    lambda: client.uwuify_many(texts, window=args.window))
+
+        connections = max(1, args.requests // 10)
+        def reconnect_each_time():
+            for t in texts[:connections]:
+                with UwuClient(address) as client:
+                    client.uwuify(t)
+        measure("new connection per request", connections, reconnect_each_time)
+    finally:
+        if service:
+            service.stop()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,194 @@
+"""
+Benchmark suite for the text-processing hot path
+Times SelectionUwuTextProcessor.process_text for every flag combination across
+input sizes and corpora, headlessly (no GUI, no keyboard hooks)
+
+    python benchmarks/bench_transform.py --save results.json
+    python benchmarks/bench_transform.py --sizes 1K,1M,50M --baseline results.json --threshold 0.1
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import uwuify
+from config_manager import TransformSettings
+from result_cache import TransformResultCache
+from text_processor import SelectionUwuTextProcessor
+
+DEFAULT_SIZES = '1K,10K,100K,1M'
+FLAG_NAMES = ('smiley', 'yu', 'stutter', 'nouwu')
+UNITS = {'K': 1024, 'M': 1024 * 1024}
+
+ASCII_WORDS = ("the", "quick", "brown", "fox", "jumps", "over", "lazy", "dog", "hello", "there",
+               "lover", "user", "your", "really", "little", "flower", "run", "rule", "under", "letter")
+UNICODE_WORDS = ASCII_WORDS + ("café", "naïve", "über", "señor", "日本語", "テキスト", "привет",
+                               "🦄", "✨", "ℓove", "straße")
+
+def parse_size(value: str) -> int:
+    """'64K' -> 65536"""
+    value = value.strip().upper()
+    if value[-1] in UNITS:
+        return int(float(value[:-1]) * UNITS[value[-1]])
+    return int(value)
+
+def make_corpus(words, size: int, seed: int = 0) -> str:
+    """Deterministic pseudo-prose of exactly size characters"""
+    rng = random.Random(seed)
+    parts = []
+    length = 0
+    while length < size:
+        sentence = " ".join(rng.choice(words) for _ in range(rng.randint(4, 14)))
+        sentence = sentence.capitalize() + rng.choice((". ", "! ", "? ", ".\n", ", "))
+        parts.append(sentence)
+        length += len(sentence)
+    return "".join(parts)[:size]
+
+def flag_label(flags: int) -> str:
+    """Readable name for a flag combination"""
+    names = [name for bit, name in enumerate(FLAG_NAMES) if flags & (1 << bit)]
+    return "+".join(names) or "none"
+
+def make_processor(flags: int, serial: bool) -> SelectionUwuTextProcessor:
+    """Processor with caching disabled and seeded smileys for reproducible output"""
+    processor = SelectionUwuTextProcessor(result_cache=TransformResultCache(max_bytes=0))
+    processor.apply_settings(TransformSettings(
+        smiley=bool(flags & uwuify.UwuifyFlag.SMILEY),
+        yu=bool(flags & uwuify.UwuifyFlag.YU),
+        stutter=bool(flags & uwuify.UwuifyFlag.STUTTER),
+        nouwu=bool(flags & uwuify.UwuifyFlag.NOUWU),
+        seeded=True,
+    ))
+    if serial:
+        processor.parallel_threshold = float('inf')
+    return processor
+
+def bench_one(processor, text: str, min_time: float) -> dict:
+    """Time one transform, then measure its memory in a separate traced run"""
+    runs = 0
+    start = time.perf_counter()
+    best = float('inf')
+    while True:
+        t0 = time.perf_counter()
+        processor.process_text(text)
+        best = min(best, time.perf_counter() - t0)
+        runs += 1
+        if time.perf_counter() - start >= min_time:
+            break
+
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    result = processor.process_text(text)
+    peak = tracemalloc.get_traced_memory()[1] - baseline
+    # One snapshot at the end: blocks the transform left allocated, its result included
+    snapshot = tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+    blocks = sum(stat.count for stat in snapshot.statistics('filename'))
+    tracemalloc.stop()
+    del result, snapshot
+
+    size_mb = len(text.encode('utf-8')) / (1024 * 1024)
+    return {
+        'seconds': best,
+        'runs': runs,
+        'mb_per_second': size_mb / best if best else 0.0,
+        'peak_bytes': peak,
+        'peak_ratio': peak / max(1, sys.getsizeof(text)),
+        'blocks': blocks,
+    }
+
+def run_suite(sizes, corpora, flag_sets, min_time: float, serial: bool) -> list:
+    """Benchmark every corpus/size/flags combination"""
+    results = []
+    for corpus_name, words in corpora:
+        for size in sizes:
+            text = make_corpus(words, size)
+            for flags in flag_sets:
+                processor = make_processor(flags, serial)
+                stats = bench_one(processor, text, min_time)
+                processor.shutdown()
+                entry = {'corpus': corpus_name, 'size': size, 'flags': flags, 'name': flag_label(flags)}
+                entry.update(stats)
+                results.append(entry)
+                print(f"{corpus_name:<8} {size:>10} {entry['name']:<26} {stats['mb_per_second']:9.2f} MB/s "
+                      f"{stats['seconds'] * 1000:10.2f} ms  peak {stats['peak_bytes'] / 1024:10.1f} KiB "
+                      f"({stats['peak_ratio']:.1f}x)  blocks {stats['blocks']:>6}")
+    return results
+
+def result_key(entry: dict) -> tuple:
+    """Identify the same case across runs"""
+    return (entry['corpus'], entry['size'], entry['flags'])
+
+def compare(results: list, baseline: dict, threshold: float, memory_threshold: float) -> list:
+    """Entries that got slower or hungrier than the baseline allows"""
+    previous = {result_key(entry): entry for entry in baseline.get('results', [])}
+    regressions = []
+    for entry in results:
+        old = previous.get(result_key(entry))
+        if not old:
+            continue
+        if entry['mb_per_second'] < old['mb_per_second'] * (1 - threshold):
+            regressions.append((entry, 'throughput', old['mb_per_second'], entry['mb_per_second']))
+        if entry['peak_bytes'] > old['peak_bytes'] * (1 + memory_threshold) and entry['peak_bytes'] > 64 * 1024:
+            regressions.append((entry, 'peak memory', old['peak_bytes'], entry['peak_bytes']))
+    return regressions
+
+def main(argv=None) -> int:
+    """Run the suite, save it and compare it against a baseline"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help=f"comma separated sizes, e.g. 1K,1M,50M (default: {DEFAULT_SIZES})")
+    parser.add_argument('--corpus', choices=('ascii', 'unicode', 'both'), default='both')
+    parser.add_argument('--flags', help="comma separated flag combinations 0-15 (default: all 16)")
+    parser.add_argument('--min-time', type=float, default=0.2, help="minimum seconds of timing per case")
+    parser.add_argument('--serial', action='store_true', help="never use the process pool")
+    parser.add_argument('--save', help="write results to this JSON file")
+    parser.add_argument('--baseline', help="compare against a previously saved JSON file")
+    parser.add_argument('--threshold', type=float, default=0.10, help="allowed throughput drop (default: 0.10)")
+    parser.add_argument('--memory-threshold', type=float, default=0.25, help="allowed peak memory growth (default: 0.25)")
+    args = parser.parse_args(argv)
+
+    sizes = [parse_size(size) for size in args.sizes.split(',')]
+    flag_sets = [int(flags) for flags in args.flags.split(',')] if args.flags else list(range(16))
+    corpora = []
+    if args.corpus in ('ascii', 'both'):
+        corpora.append(('ascii', ASCII_WORDS))
+    if args.corpus in ('unicode', 'both'):
+        corpora.append(('unicode', UNICODE_WORDS))
+
+    results = run_suite(sizes, corpora, flag_sets, args.min_time, args.serial)
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'uwuify': getattr(uwuify, '__version__', 'unknown'),
+        },
+        'results': results,
+    }
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved results to {args.save}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold, args.memory_threshold)
+        for entry, metric, old, new in regressions:
+            print(f"❌ {entry['corpus']} {entry['size']} {entry['name']}: {metric} {old:.2f} -> {new:.2f}")
+        if regressions:
+            return 1
+        print("✅ No regressions against baseline")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
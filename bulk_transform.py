@@ -0,0 +1,160 @@
+"""
+Bulk directory UwUifier
+Transforms a whole tree of text files on a bounded worker pool, skipping files
+that haven't changed since the last run
+"""
+import fnmatch
+import json
+import mmap
+import os
+import stat
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Optional, List, Tuple
+from uwu_engine import compile_pipeline, flags_from_options, warm_worker
+
+MANIFEST_NAME = '.uwuifier-manifest.json'
+
+def _default_file_mode() -> int:
+    """Mode open() would give a new file (mkstemp's are always 0600)"""
+    # The umask can only be read by setting it, so it's briefly 0 here
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+def _read_text(path: str, encoding: str) -> str:
+    """Read a file through a read-only memory map"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return ""
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            # Decoding the map directly avoids an intermediate bytes copy
+            return str(memoryview(mapped), encoding)
+
+def _write_atomic(path: str, text: str, encoding: str, mode: Optional[int] = None):
+    """Write to a temp file in the same directory, then swap it into place with the
+    given permissions (by default those of a newly created file)"""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.uwu-', suffix='.tmp')
+    try:
+        with open(fd, 'w', encoding=encoding, newline='') as f:
+            f.write(text)
+        os.chmod(temp_path, _default_file_mode() if mode is None else mode)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+def transform_file(source: str, destination: str, flags: int, seed: Optional[int], encoding: str) -> int:
+    """Transform one file (runs in pool workers), returning the bytes read"""
+    text = _read_text(source, encoding)
+    if text.strip():
+        text = compile_pipeline(flags)(text, seed=seed)
+    source_stat = os.stat(source)
+    _write_atomic(destination, text, encoding, stat.S_IMODE(source_stat.st_mode))
+    return source_stat.st_size
+
+class BulkTransformer:
+    """Walks a directory and uwuifies every matching file into a mirror tree"""
+
+    def __init__(self, settings, workers: Optional[int] = None, include: Tuple[str, ...] = ('*',),
+                 encoding: str = 'utf-8'):
+        self.flags = int(flags_from_options(settings.smiley, settings.yu, settings.stutter, settings.nouwu))
+        self.seed = settings.seed if settings.seeded else None
+        self.workers = workers or max(1, (os.cpu_count() or 1) - 1)
+        self.include = include
+        self.encoding = encoding
+        # Changing flags invalidates every previous output
+        self.settings_key = [self.flags, self.seed]
+
+    def _find_files(self, source_dir: str, destination_dir: str) -> List[str]:
+        """Relative paths of every file to transform"""
+        found = []
+        for root, dirs, files in os.walk(source_dir):
+            # Never descend into the output tree when it lives inside the source
+            dirs[:] = sorted(d for d in dirs if os.path.join(root, d) != destination_dir)
+            for name in sorted(files):
+                if name == MANIFEST_NAME or not any(fnmatch.fnmatch(name, pattern) for pattern in self.include):
+                    continue
+                found.append(os.path.relpath(os.path.join(root, name), source_dir))
+        return found
+
+    def _load_manifest(self, path: str) -> dict:
+        """Load the manifest from a previous run, if any"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def run(self, source_dir: str, destination_dir: str) -> dict:
+        """Transform source_dir into destination_dir and return run statistics"""
+        source_dir = os.path.abspath(source_dir)
+        destination_dir = os.path.abspath(destination_dir)
+        manifest_path = os.path.join(destination_dir, MANIFEST_NAME)
+        manifest = self._load_manifest(manifest_path)
+        if manifest.get('settings') != self.settings_key:
+            manifest = {'settings': self.settings_key, 'files': {}}
+        entries = manifest['files']
+
+        stats = {'files': 0, 'skipped': 0, 'errors': 0, 'bytes': 0}
+        start_time = time.perf_counter()
+
+        # Only keep a couple of jobs per worker in flight so huge trees don't queue everything
+        max_pending = self.workers * 2
+        pending = {}
+
+        def collect(done):
+            for future in done:
+                relative, signature = pending.pop(future)
+                try:
+                    stats['bytes'] += future.result()
+                    stats['files'] += 1
+                    entries[relative] = signature
+                except Exception as e:
+                    stats['errors'] += 1
+                    entries.pop(relative, None)
+                    print(f"❌ {relative}: {e}")
+
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=warm_worker) as pool:
+            for relative in self._find_files(source_dir, destination_dir):
+                source = os.path.join(source_dir, relative)
+                destination = os.path.join(destination_dir, relative)
+                try:
+                    info = os.stat(source)
+                except OSError:
+                    continue
+                signature = [info.st_mtime_ns, info.st_size]
+
+                if entries.get(relative) == signature and os.path.exists(destination):
+                    stats['skipped'] += 1
+                    continue
+
+                if len(pending) >= max_pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+
+                future = pool.submit(transform_file, source, destination, self.flags, self.seed, self.encoding)
+                pending[future] = (relative, signature)
+
+            collect(wait(pending).done)
+
+        os.makedirs(destination_dir, exist_ok=True)
+        _write_atomic(manifest_path, json.dumps(manifest, indent=2), 'utf-8')
+
+        elapsed = max(time.perf_counter() - start_time, 1e-9)
+        stats['seconds'] = elapsed
+        stats['files_per_second'] = stats['files'] / elapsed
+        stats['mb_per_second'] = stats['bytes'] / elapsed / (1024 * 1024)
+        return stats
+
+def format_stats(stats: dict) -> str:
+    """One-line summary of a bulk run"""
+    return (f"✅ {stats['files']} files uwuified, {stats['skipped']} unchanged, {stats['errors']} errors "
+            f"in {stats['seconds']:.2f}s ({stats['files_per_second']:.1f} files/s, "
+            f"{stats['mb_per_second']:.2f} MB/s)")
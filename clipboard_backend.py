@@ -0,0 +1,302 @@
+"""
+Clipboard backends
+Text access plus a cheap change counter, so callers can tell that a copy
+happened without reading and comparing the clipboard contents, snapshots for
+saving and restoring the user's clipboard, and the synthetic copy/paste
+keystrokes. MemoryClipboardBackend fakes all of it for headless benchmarks.
+"""
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+import pyperclip
+from clipboard_snapshot import ClipboardSnapshot
+from clipboard_wait import ClipboardChangeNotifier
+from input_backend import InputBackend
+from timing_profiles import DEFAULT_APP, foreground_app
+
+TEXT_FORMAT = 'text'
+# Windows formats whose data is a GDI or owner handle rather than global memory;
+# CF_DIB/CF_DIBV5 carry the same images and are saved instead
+WIN_HANDLE_FORMATS = {2, 3, 9, 14, 0x80, 0x82, 0x83, 0x8E}
+# Formats Windows converts between on request (CF_TEXT/CF_OEMTEXT/CF_UNICODETEXT,
+# CF_DIB/CF_DIBV5); the owner's own one is listed first and brings the rest back
+WIN_SYNTHESIZED_GROUPS = ({1, 7, 13}, {8, 17})
+# Registered formats OLE puts on the clipboard for a data object (whose formats
+# are all rendered only when someone asks for them); they point at the live
+# object, so they mean nothing once it's gone and aren't saved
+OLE_PRIVATE_FORMATS = ('DataObject', 'Ole Private Data')
+GMEM_MOVEABLE = 0x0002
+OPEN_CLIPBOARD_ATTEMPTS = 10
+
+class ClipboardBackend:
+    """Clipboard text through pyperclip, keystrokes through the input backend, and a content-hash change counter"""
+
+    name = 'hash'
+
+    def __init__(self, input_backend: Optional[InputBackend] = None):
+        self.input = input_backend or InputBackend()
+        self._hash = None
+        self._count = 0
+
+    def paste(self) -> str:
+        """Current clipboard text"""
+        return pyperclip.paste()
+
+    def copy(self, text: str):
+        """Replace the clipboard text"""
+        pyperclip.copy(text)
+        self._hash = hash(text)
+        self._count += 1
+
+    def change_count(self) -> int:
+        """Counter that moves whenever the clipboard changes
+
+        The fallback has no OS counter to ask, so it reads the clipboard and
+        compares hashes. Copies of identical text therefore go unnoticed.
+        """
+        try:
+            current = hash(self.paste())
+        except Exception:
+            return self._count
+        if current != self._hash:
+            self._hash = current
+            self._count += 1
+        return self._count
+
+    def send_copy(self):
+        """Ask the focused application to copy its selection"""
+        self.input.press_and_release('ctrl+c')
+
+    def send_paste(self):
+        """Ask the focused application to paste the clipboard"""
+        self.input.press_and_release('ctrl+v')
+
+    def is_pressed(self, key: str) -> bool:
+        """Whether a key is currently held down"""
+        return self.input.is_pressed(key)
+
+    def foreground_app(self) -> str:
+        """Name of the application that receives the keystrokes"""
+        return foreground_app()
+
+    def snapshot(self) -> ClipboardSnapshot:
+        """Save the clipboard; pyperclip can only reach the text"""
+        snapshot = ClipboardSnapshot()
+        text = self.paste()
+        if text:
+            snapshot.add(TEXT_FORMAT, text.encode('utf-8', 'surrogatepass'))
+        return snapshot
+
+    def restore(self, snapshot: ClipboardSnapshot):
+        """Put a snapshot back on the clipboard"""
+        data = snapshot.get(TEXT_FORMAT)
+        self.copy(data.decode('utf-8', 'surrogatepass') if data is not None else "")
+
+class WindowsClipboardBackend(ClipboardBackend):
+    """Uses GetClipboardSequenceNumber, which changes on every clipboard write"""
+
+    name = 'sequence'
+
+    def __init__(self, input_backend: Optional[InputBackend] = None):
+        super().__init__(input_backend)
+        import ctypes
+        from ctypes import wintypes
+        self._ctypes = ctypes
+        self._user32 = user32 = ctypes.windll.user32
+        self._kernel32 = kernel32 = ctypes.windll.kernel32
+        # Handles are pointer sized, so the default int return type would truncate them
+        user32.GetClipboardData.restype = wintypes.HANDLE
+        user32.SetClipboardData.restype = wintypes.HANDLE
+        user32.SetClipboardData.argtypes = (wintypes.UINT, wintypes.HANDLE)
+        user32.OpenClipboard.argtypes = (wintypes.HWND,)
+        user32.CreateWindowExW.restype = wintypes.HWND
+        user32.CreateWindowExW.argtypes = (wintypes.DWORD, wintypes.LPCWSTR, wintypes.LPCWSTR, wintypes.DWORD,
+                                           ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int, wintypes.HWND,
+                                           wintypes.HMENU, wintypes.HINSTANCE, wintypes.LPVOID)
+        user32.DestroyWindow.argtypes = (wintypes.HWND,)
+        user32.RegisterClipboardFormatW.argtypes = (wintypes.LPCWSTR,)
+        kernel32.GlobalAlloc.restype = wintypes.HGLOBAL
+        kernel32.GlobalAlloc.argtypes = (wintypes.UINT, ctypes.c_size_t)
+        kernel32.GlobalLock.restype = ctypes.c_void_p
+        kernel32.GlobalLock.argtypes = (wintypes.HGLOBAL,)
+        kernel32.GlobalUnlock.argtypes = (wintypes.HGLOBAL,)
+        kernel32.GlobalSize.restype = ctypes.c_size_t
+        kernel32.GlobalSize.argtypes = (wintypes.HGLOBAL,)
+        kernel32.GlobalFree.argtypes = (wintypes.HGLOBAL,)
+        self._sequence = user32.GetClipboardSequenceNumber
+        self._ole_formats = {user32.RegisterClipboardFormatW(name) for name in OLE_PRIVATE_FORMATS}
+
+    def copy(self, text: str):
+        pyperclip.copy(text)
+
+    def change_count(self) -> int:
+        return self._sequence()
+
+    def _open(self, owner=None) -> bool:
+        """Open the clipboard, retrying while another application holds it"""
+        for attempt in range(OPEN_CLIPBOARD_ATTEMPTS):
+            if self._user32.OpenClipboard(owner):
+                return True
+            time.sleep(0.005 * (attempt + 1))
+        return False
+
+    def _snapshot_formats(self) -> List[int]:
+        """Formats worth saving: the owner's own global-memory formats
+        
+        Delay-rendered formats (an OLE data object's, a large spreadsheet
+        range or image) are rendered by the owner when GetClipboardData asks
+        for them. Conversions Windows synthesizes are skipped.
+        """
+        formats = []
+        clipboard_format = self._user32.EnumClipboardFormats(0)
+        while clipboard_format:
+            formats.append(clipboard_format)
+            clipboard_format = self._user32.EnumClipboardFormats(clipboard_format)
+        wanted, groups_seen = [], set()
+        for clipboard_format in formats:
+            if clipboard_format in WIN_HANDLE_FORMATS or clipboard_format in self._ole_formats:
+                continue
+            group = next((i for i, group in enumerate(WIN_SYNTHESIZED_GROUPS) if clipboard_format in group), None)
+            if group is not None:
+                if group in groups_seen:
+                    continue
+                groups_seen.add(group)
+            wanted.append(clipboard_format)
+        return wanted
+
+    def snapshot(self) -> ClipboardSnapshot:
+        """Save every clipboard format, one payload at a time
+        
+        Large payloads spill to disk inside the snapshot. Formats the owner
+        fails to render are listed in snapshot.missing.
+        """
+        snapshot = ClipboardSnapshot()
+        if not self._open():
+            raise OSError("clipboard is locked by another application")
+        try:
+            for clipboard_format in self._snapshot_formats():
+                handle = self._user32.GetClipboardData(clipboard_format)
+                pointer = self._kernel32.GlobalLock(handle) if handle else None
+                if not pointer:
+                    snapshot.missing.append(clipboard_format)
+                    continue
+                try:
+                    size = self._kernel32.GlobalSize(handle)
+                    # Read straight from the global memory, without an extra bytes copy
+                    snapshot.add(clipboard_format, (self._ctypes.c_char * size).from_address(pointer))
+                finally:
+                    self._kernel32.GlobalUnlock(handle)
+        finally:
+            self._user32.CloseClipboard()
+        return snapshot
+
+    def restore(self, snapshot: ClipboardSnapshot):
+        """Put every saved format back exactly as it was"""
+        # SetClipboardData fails after EmptyClipboard unless the clipboard has an owner window
+        owner = self._user32.CreateWindowExW(0, "STATIC", None, 0, 0, 0, 0, 0, None, None, None, None)
+        if not self._open(owner):
+            self._user32.DestroyWindow(owner)
+            raise OSError("clipboard is locked by another application")
+        try:
+            self._user32.EmptyClipboard()
+            for clipboard_format, data in snapshot.items():
+                handle = self._kernel32.GlobalAlloc(GMEM_MOVEABLE, max(1, len(data)))
+                if not handle:
+                    continue
+                pointer = self._kernel32.GlobalLock(handle)
+                self._ctypes.memmove(pointer, data, len(data))
+                self._kernel32.GlobalUnlock(handle)
+                # The clipboard owns the memory once SetClipboardData succeeds
+                if not self._user32.SetClipboardData(clipboard_format, handle):
+                    self._kernel32.GlobalFree(handle)
+        finally:
+            self._user32.CloseClipboard()
+            self._user32.DestroyWindow(owner)
+
+class NotifierClipboardBackend(ClipboardBackend):
+    """Counts clipboard owner-change events (QClipboard.dataChanged)"""
+
+    name = 'events'
+
+    def __init__(self, notifier: ClipboardChangeNotifier, input_backend: Optional[InputBackend] = None):
+        super().__init__(input_backend)
+        self.notifier = notifier
+
+    def copy(self, text: str):
+        pyperclip.copy(text)
+
+    def change_count(self) -> int:
+        return self.notifier.changes
+
+class MemoryClipboardBackend(ClipboardBackend):
+    """In-memory clipboard and a simulated focused application, for headless benchmarks
+
+    send_copy publishes `selection` to the clipboard after the focused app's
+    copy latency; send_paste records the clipboard into `pasted` after the
+    paste latency and sets `paste_event`.
+    """
+
+    name = 'memory'
+
+    def __init__(self, selection: str = "", copy_latency: float = 0.0, paste_latency: float = 0.0,
+                 app_latencies: Optional[Dict[str, float]] = None, app: str = DEFAULT_APP):
+        super().__init__()
+        self.text = ""
+        self.selection = selection
+        self.copy_latency = copy_latency
+        self.paste_latency = paste_latency
+        # Per-application copy latency, overriding copy_latency for that app
+        self.app_latencies = app_latencies or {}
+        self.app = app
+        self.pasted: List[str] = []
+        self.paste_event = threading.Event()
+        self._lock = threading.Lock()
+
+    def paste(self) -> str:
+        return self.text
+
+    def copy(self, text: str):
+        with self._lock:
+            self.text = text
+            self._count += 1
+
+    def change_count(self) -> int:
+        return self._count
+
+    def _later(self, delay: float, action):
+        """Run action now, or after delay on a timer thread like a real app would"""
+        if delay <= 0:
+            action()
+        else:
+            timer = threading.Timer(delay, action)
+            timer.daemon = True
+            timer.start()
+
+    def send_copy(self):
+        selection = self.selection
+        self._later(self.app_latencies.get(self.app, self.copy_latency), lambda: self.copy(selection))
+
+    def send_paste(self):
+        def paste():
+            self.pasted.append(self.text)
+            self.paste_event.set()
+        self._later(self.paste_latency, paste)
+
+    def is_pressed(self, key: str) -> bool:
+        return False
+
+    def foreground_app(self) -> str:
+        return self.app
+
+def create_clipboard_backend(notifier: Optional[ClipboardChangeNotifier] = None,
+                             input_backend: Optional[InputBackend] = None) -> ClipboardBackend:
+    """Best change counter for this platform: OS sequence number, change events, or hashing"""
+    if sys.platform == 'win32':
+        try:
+            return WindowsClipboardBackend(input_backend)
+        except (AttributeError, OSError) as e:
+            print(f"Clipboard sequence number unavailable: {e}")
+    if notifier is not None:
+        return NotifierClipboardBackend(notifier, input_backend)
+    return ClipboardBackend(input_backend)
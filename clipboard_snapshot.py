@@ -0,0 +1,90 @@
+"""
+Clipboard snapshots
+Holds every clipboard format saved before the hook takes over the clipboard,
+keeping large payloads compressed or spilled to a temp file
+"""
+import tempfile
+import zlib
+from typing import Iterator, List, Optional, Tuple
+
+# Payloads up to this size are kept as they are
+INLINE_LIMIT = 64 * 1024
+# Larger payloads are compressed in memory up to this size...
+SPILL_THRESHOLD = 8 * 1024 * 1024
+# ...and the snapshot never keeps more than this in memory; the rest goes to disk
+MAX_MEMORY = 32 * 1024 * 1024
+
+RAW, COMPRESSED, SPILLED = 'raw', 'compressed', 'spilled'
+
+class ClipboardSnapshot:
+    """Saved clipboard formats, restored in their original order"""
+
+    def __init__(self, max_memory: int = MAX_MEMORY):
+        self.max_memory = max_memory
+        # (format, storage kind, payload or file offset, original size)
+        self._entries: List[Tuple[object, str, object, int]] = []
+        self._spill_file = None
+        self.memory_bytes = 0
+        self.size = 0  # Uncompressed bytes across all formats
+        self.missing: list = []  # Formats that were on the clipboard but couldn't be saved
+
+    @property
+    def formats(self) -> list:
+        return [entry[0] for entry in self._entries or ()]
+
+    @property
+    def released(self) -> bool:
+        return self._entries is None
+
+    def add(self, clipboard_format, data) -> None:
+        """Store one format's payload (any bytes-like object, copied here)"""
+        size = len(memoryview(data).cast('B'))
+        self.size += size
+        if size <= INLINE_LIMIT and self.memory_bytes + size <= self.max_memory:
+            payload = bytes(data)
+            self._entries.append((clipboard_format, RAW, payload, size))
+            self.memory_bytes += size
+            return
+
+        if size <= SPILL_THRESHOLD:
+            payload = zlib.compress(data, 1)
+            if self.memory_bytes + len(payload) <= self.max_memory:
+                self._entries.append((clipboard_format, COMPRESSED, payload, size))
+                self.memory_bytes += len(payload)
+                return
+
+        if self._spill_file is None:
+            # Deleted by the OS as soon as it's closed
+            self._spill_file = tempfile.TemporaryFile(prefix='uwuifier-clip-')
+        offset = self._spill_file.seek(0, 2)
+        self._spill_file.write(data)
+        self._entries.append((clipboard_format, SPILLED, offset, size))
+
+    def items(self) -> Iterator[Tuple[object, bytes]]:
+        """Yield (format, payload) one at a time, so only one is expanded at once"""
+        for clipboard_format, kind, payload, size in self._entries or ():
+            if kind == RAW:
+                yield clipboard_format, payload
+            elif kind == COMPRESSED:
+                yield clipboard_format, zlib.decompress(payload)
+            else:
+                self._spill_file.seek(payload)
+                yield clipboard_format, self._spill_file.read(size)
+
+    def get(self, clipboard_format) -> Optional[bytes]:
+        """Payload of a single format, or None if it wasn't saved"""
+        for saved_format, payload in self.items():
+            if saved_format == clipboard_format:
+                return payload
+        return None
+
+    def release(self):
+        """Drop every payload and delete the spill file"""
+        self._entries = None
+        self.memory_bytes = 0
+        if self._spill_file is not None:
+            try:
+                self._spill_file.close()
+            except OSError:
+                pass
+            self._spill_file = None
@@ -0,0 +1,67 @@
+"""
+Clipboard readiness helpers
+Waits for clipboard changes with change notifications where available and
+exponential backoff polling otherwise, instead of fixed sleeps
+"""
+import threading
+import time
+from typing import Callable, Optional
+
+INITIAL_POLL_INTERVAL = 0.005
+MAX_POLL_INTERVAL = 0.05
+DEFAULT_CLIPBOARD_TIMEOUT = 0.6
+
+class ClipboardChangeNotifier:
+    """Counts clipboard change notifications (e.g. from QClipboard.dataChanged)
+    and lets other threads block until the next one"""
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self.changes = 0
+
+    def notify(self):
+        """Record a clipboard change; safe to connect directly to a Qt signal"""
+        with self._condition:
+            self.changes += 1
+            self._condition.notify_all()
+
+    def wait_for_change(self, since: int, timeout: float) -> bool:
+        """Wait until more than `since` changes have been seen"""
+        with self._condition:
+            return self._condition.wait_for(lambda: self.changes > since, max(0.0, timeout))
+
+def wait_until(condition: Callable[[], bool], timeout: float,
+               notifier: Optional[ClipboardChangeNotifier] = None, since: int = 0,
+               initial_interval: float = INITIAL_POLL_INTERVAL) -> bool:
+    """Check condition with exponential backoff until it holds or timeout passes
+
+    With a notifier, each backoff interval ends early as soon as a change
+    notification arrives, so the check runs right when the clipboard changes.
+    """
+    deadline = time.monotonic() + timeout
+    interval = initial_interval
+    while True:
+        if condition():
+            return True
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        wait = min(interval, remaining)
+        if notifier is not None:
+            if notifier.wait_for_change(since, wait):
+                since = notifier.changes
+        else:
+            time.sleep(wait)
+        interval = min(interval * 2, MAX_POLL_INTERVAL)
+
+def wait_for_clipboard_change(change_count: Callable[[], int], since: int, timeout: float,
+                              notifier: Optional[ClipboardChangeNotifier] = None,
+                              initial_interval: float = INITIAL_POLL_INTERVAL) -> bool:
+    """Wait for a clipboard backend's change counter to move past since"""
+    def changed() -> bool:
+        try:
+            return change_count() != since
+        except Exception:
+            return False
+
+    return wait_until(changed, timeout, notifier, notifier.changes if notifier else 0, initial_interval)
@@ -1,6 +1,19 @@
 import json
 import os
-from typing import Dict, Any
+from typing import Dict, Any, Callable, List, NamedTuple, Tuple
+
+# Config keys that change how text is transformed
+TRANSFORM_KEYS = ('smiley', 'yu', 'stutter', 'nouwu', 'seeded', 'seed')
+
+class TransformSettings(NamedTuple):
+    """Immutable, versioned snapshot of the transform settings"""
+    version: int = 0
+    smiley: bool = False
+    yu: bool = False
+    stutter: bool = False
+    nouwu: bool = False
+    seeded: bool = False  # Deterministic smileys instead of random ones
+    seed: int = 0
 
 class ConfigManager:
     def __init__(self):
@@ -13,9 +26,32 @@ class ConfigManager:
             'smiley': False,
             'yu': False, 
             'stutter': False,
-            'nouwu': False
+            'nouwu': False,
+            'seeded': False,
+            'seed': 0,
+            'service_enabled': False,
+            'service_address': '',
+            'clipboard_timeout': 0.6,
+            'cancel_on_press': False,
+            'primary_selection': False,
+            'speculative_transform': False,
+            'speculation_max_size': 512 * 1024,
+            'undo_hotkey': '',
+            'repaste_hotkey': '',
+            # Named flag profiles on their own hotkeys, e.g.
+            # {"stutter": {"hotkey": "f9", "stutter": true},
+            #  "everything": {"hotkey": "f10", "smiley": true, "yu": true, "stutter": true}}
+            'hotkey_profiles': {},
+            # 'keyboard' or 'pynput'; measure_input_overhead also times every key event
+            'input_backend': 'keyboard',
+            'measure_input_overhead': False,
+            # Uwuify words as they are typed; the hotkey switches it on and off
+            'live_typing': False,
+            'live_typing_hotkey': ''
         }
         self.config = self.load_config()
+        self._settings_listeners: List[Callable[[TransformSettings], None]] = []
+        self.transform_settings = self._build_transform_settings(0)
     
     def load_config(self) -> Dict[str, Any]:
         """Load configuration from file or create default"""
@@ -45,8 +81,59 @@ class ConfigManager:
     
     def set(self, key: str, value: Any):
         """Set configuration value and save"""
-        self.config[key] = value
+        self.update({key: value})
+    
+    def update(self, values: Dict[str, Any]):
+        """Set several configuration values, saving and publishing the transform settings once"""
+        changed = {key for key, value in values.items() if self.config.get(key) != value}
+        self.config.update(values)
         self.save_config()
+        
+        if changed.intersection(TRANSFORM_KEYS):
+            self._publish_transform_settings()
+    
+    def _build_transform_settings(self, version: int, source: Dict[str, Any] = None) -> TransformSettings:
+        """Snapshot the current transform settings (or the ones in source)"""
+        source = self.config if source is None else source
+        return TransformSettings(
+            version,
+            smiley=bool(source.get('smiley', False)),
+            yu=bool(source.get('yu', False)),
+            stutter=bool(source.get('stutter', False)),
+            nouwu=bool(source.get('nouwu', False)),
+            seeded=bool(source.get('seeded', False)),
+            seed=int(source.get('seed') or 0),
+        )
+    
+    def hotkey_profiles(self) -> List[Tuple[str, str, TransformSettings]]:
+        """(name, hotkey, settings) for every profile that has a hotkey
+        
+        Flags a profile doesn't mention are off, independent of the main settings.
+        """
+        profiles = []
+        for name, profile in (self.config.get('hotkey_profiles') or {}).items():
+            if not isinstance(profile, dict) or not profile.get('hotkey'):
+                print(f"Skipping hotkey profile '{name}' without a hotkey")
+                continue
+            try:
+                profiles.append((name, profile['hotkey'], self._build_transform_settings(0, profile)))
+            except (TypeError, ValueError) as e:
+                print(f"Skipping invalid hotkey profile '{name}': {e}")
+        return profiles
+    
+    def _publish_transform_settings(self):
+        """Replace the snapshot and push it to every listener"""
+        self.transform_settings = self._build_transform_settings(self.transform_settings.version + 1)
+        for listener in list(self._settings_listeners):
+            try:
+                listener(self.transform_settings)
+            except Exception as e:
+                print(f"Error notifying settings listener: {e}")
+    
+    def add_settings_listener(self, listener: Callable[[TransformSettings], None]):
+        """Register a callback that receives every new snapshot, starting with the current one"""
+        self._settings_listeners.append(listener)
+        listener(self.transform_settings)
     
     def is_enabled(self) -> bool:
         """Check if uwuifier is enabled"""
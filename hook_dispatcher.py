@@ -0,0 +1,151 @@
+"""
+Hook work dispatcher
+One long-lived thread that runs hotkey jobs serially and fires delayed actions
+from a timer queue, instead of a new sleeping thread per press
+"""
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from typing import Callable, Optional
+
+class ScheduledAction:
+    """Handle for a delayed action; cancel() stops it from running"""
+
+    def __init__(self, due: float, action: Callable[[], None]):
+        self.due = due
+        self.action = action
+        self.cancelled = False
+        self.done = False
+
+    @property
+    def pending(self) -> bool:
+        return not (self.cancelled or self.done)
+
+    def cancel(self) -> bool:
+        """Cancel the action, returning False if it already ran"""
+        if self.done:
+            return False
+        self.cancelled = True
+        self.action = None  # Release whatever the action holds on to right away
+        return True
+
+class HookDispatcher:
+    """Serial job queue plus timer queue, both served by a single thread
+
+    Jobs run in submission order. Due timers fire between jobs, never during
+    one, so a delayed action can't interleave with a running job.
+    """
+
+    def __init__(self, name: str = 'uwu-hook'):
+        self.name = name
+        self._condition = threading.Condition()
+        self._jobs = deque()
+        self._timers = []
+        self._order = itertools.count()  # Tie-breaker for timers due at the same time
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self.jobs_run = 0
+        self.timers_fired = 0
+        self.timers_cancelled = 0
+
+    def start(self):
+        """Start the dispatcher thread"""
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0):
+        """Stop the thread, dropping queued jobs and timers"""
+        with self._condition:
+            self._running = False
+            self._jobs.clear()
+            for _, _, timer in self._timers:
+                timer.cancel()
+            self._timers.clear()
+            self._condition.notify_all()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self._thread = None
+
+    def submit(self, job: Callable[[], None]) -> bool:
+        """Queue a job to run on the dispatcher thread"""
+        with self._condition:
+            if not self._running:
+                return False
+            self._jobs.append(job)
+            self._condition.notify()
+        return True
+
+    def schedule(self, delay: float, action: Callable[[], None]) -> ScheduledAction:
+        """Run action on the dispatcher thread after delay seconds"""
+        timer = ScheduledAction(time.monotonic() + delay, action)
+        with self._condition:
+            heapq.heappush(self._timers, (timer.due, next(self._order), timer))
+            self._condition.notify()
+        return timer
+
+    def cancel(self, timer: Optional[ScheduledAction]) -> bool:
+        """Cancel a scheduled action (None is ignored)"""
+        if timer is None:
+            return False
+        with self._condition:
+            cancelled = timer.cancel()
+            if cancelled:
+                self.timers_cancelled += 1
+        return cancelled
+
+    @property
+    def queue_depth(self) -> int:
+        """Jobs waiting to run"""
+        return len(self._jobs)
+
+    def metrics(self) -> dict:
+        """Queue depth, pending timers and thread counts"""
+        with self._condition:
+            pending_timers = sum(1 for _, _, timer in self._timers if timer.pending)
+            return {
+                'queue_depth': len(self._jobs),
+                'pending_timers': pending_timers,
+                'dispatcher_threads': 1 if self._thread and self._thread.is_alive() else 0,
+                'process_threads': threading.active_count(),
+                'jobs_run': self.jobs_run,
+                'timers_fired': self.timers_fired,
+                'timers_cancelled': self.timers_cancelled,
+            }
+
+    def _next_work(self):
+        """Block until a timer is due or a job is queued; None means stop"""
+        with self._condition:
+            while self._running:
+                now = time.monotonic()
+                # Drop cancelled timers off the top of the heap
+                while self._timers and not self._timers[0][2].pending:
+                    heapq.heappop(self._timers)
+                if self._timers and self._timers[0][0] <= now:
+                    timer = heapq.heappop(self._timers)[2]
+                    action = timer.action
+                    timer.done = True
+                    self.timers_fired += 1
+                    return action
+                if self._jobs:
+                    self.jobs_run += 1
+                    return self._jobs.popleft()
+                timeout = self._timers[0][0] - now if self._timers else None
+                self._condition.wait(timeout)
+            return None
+
+    def _run(self):
+        """Dispatcher thread main loop"""
+        while True:
+            work = self._next_work()
+            if work is None:
+                break
+            try:
+                work()
+            except Exception as e:
+                print(f"Error in hook dispatcher: {e}")
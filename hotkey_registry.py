@@ -0,0 +1,84 @@
+"""
+Hotkey registry
+Keeps the handle of every global hotkey binding so bindings can be added,
+removed and swapped one at a time instead of unhooking everything
+"""
+import threading
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+from input_backend import InputBackend
+
+class HotkeyBinding(NamedTuple):
+    """One registered hotkey and the handle needed to remove it"""
+    hotkey: str
+    callback: Callable
+    args: tuple
+    handle: object
+
+class HotkeyRegistry:
+    """Named hotkey bindings, each added and removed through its own handle"""
+
+    def __init__(self, input_backend: Optional[InputBackend] = None):
+        self.input = input_backend or InputBackend()
+        self._bindings: Dict[str, HotkeyBinding] = {}
+        self._lock = threading.Lock()
+
+    def bind(self, name: str, hotkey: str, callback: Callable, args: tuple = ()) -> bool:
+        """Bind (or rebind) name to hotkey; returns False if the hotkey couldn't be added
+
+        Rebinding adds the new hotkey before removing the old one, so the
+        action is never without a hotkey, and a failed rebind keeps the old one.
+        """
+        with self._lock:
+            old = self._bindings.get(name)
+            if old is not None and (old.hotkey, old.callback, old.args) == (hotkey, callback, args):
+                return True
+            try:
+                handle = self.input.add_hotkey(hotkey, callback, args)
+            except Exception as e:
+                print(f"Error binding '{hotkey}': {e}")
+                return False
+            self._bindings[name] = HotkeyBinding(hotkey, callback, args, handle)
+            if old is not None:
+                self._remove(old)
+            return True
+
+    def unbind(self, name: str) -> bool:
+        """Remove one binding; returns False if name wasn't bound"""
+        with self._lock:
+            binding = self._bindings.pop(name, None)
+            if binding is None:
+                return False
+            self._remove(binding)
+            return True
+
+    def unbind_all(self):
+        """Remove every binding made through this registry (and nothing else)"""
+        with self._lock:
+            bindings, self._bindings = self._bindings, {}
+            for binding in bindings.values():
+                self._remove(binding)
+
+    def sync(self, wanted: Dict[str, Tuple[str, Callable, tuple]]):
+        """Make the bindings match wanted ({name: (hotkey, callback, args)}), touching only what changed"""
+        with self._lock:
+            stale = [name for name in self._bindings if name not in wanted]
+        for name in stale:
+            self.unbind(name)
+        for name, (hotkey, callback, args) in wanted.items():
+            self.bind(name, hotkey, callback, args)
+
+    def hotkey(self, name: str) -> Optional[str]:
+        """The hotkey currently bound to name, or None"""
+        binding = self._bindings.get(name)
+        return binding.hotkey if binding else None
+
+    def __len__(self) -> int:
+        return len(self._bindings)
+
+    def _remove(self, binding: HotkeyBinding):
+        try:
+            self.input.remove_hotkey(binding.handle)
+        except (KeyError, ValueError) as e:
+            print(f"Hotkey '{binding.hotkey}' was already removed: {e}")
+        except Exception as e:
+            print(f"Error removing hotkey '{binding.hotkey}': {e}")
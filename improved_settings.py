@@ -412,14 +412,14 @@ class ImprovedSettingsDialog(QDialog):
         # Get selected hotkey
         selected_hotkey = self.hotkey_selector.get_selected_hotkey()
         
-        # Save to config
-        self.config_manager.set('hotkey', selected_hotkey)
-        
-        # Save uwuify flags
-        self.config_manager.set('smiley', self.smiley_cb.isChecked())
-        self.config_manager.set('yu', self.yu_cb.isChecked())
-        self.config_manager.set('stutter', self.stutter_cb.isChecked())
-        self.config_manager.set('nouwu', self.nouwu_cb.isChecked())
+        # Save the hotkey and uwuify flags together, so one settings snapshot is published
+        self.config_manager.update({
+            'hotkey': selected_hotkey,
+            'smiley': self.smiley_cb.isChecked(),
+            'yu': self.yu_cb.isChecked(),
+            'stutter': self.stutter_cb.isChecked(),
+            'nouwu': self.nouwu_cb.isChecked(),
+        })
         
         print("Settings saved successfully!")
         
@@ -0,0 +1,324 @@
+"""
+Input backends
+Global hotkeys, synthetic keystrokes and key state through either the
+keyboard library or pynput, instrumented with the time from a key event to
+the hotkey callback and the per-event overhead the hook adds to all typing
+"""
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+import keyboard
+
+DEFAULT_INPUT_BACKEND = 'keyboard'
+# Latency samples kept per statistic
+STATS_WINDOW = 1024
+# keyboard-library key names that pynput spells differently
+PYNPUT_KEY_NAMES = {'windows': 'cmd', 'win': 'cmd', 'command': 'cmd', 'control': 'ctrl',
+                    'escape': 'esc', 'return': 'enter', 'del': 'delete', 'ins': 'insert',
+                    'pgup': 'page_up', 'page up': 'page_up', 'pgdn': 'page_down', 'page down': 'page_down'}
+# pynput key names reported under the keyboard library's name instead
+PYNPUT_NAMES = {'cmd': 'windows', 'cmd_l': 'windows', 'cmd_r': 'windows', 'alt_gr': 'alt gr'}
+# Windows low-level hook messages and the flags marking synthetic events
+WM_KEYDOWN, WM_SYSKEYDOWN = 0x0100, 0x0104
+LLKHF_INJECTED, LLKHF_LOWER_IL_INJECTED = 0x10, 0x02
+
+class InputLatencyStats:
+    """Rolling samples of hotkey dispatch latency and per-event hook overhead"""
+
+    def __init__(self, window: int = STATS_WINDOW):
+        self.dispatch = deque(maxlen=window)
+        self.overhead = deque(maxlen=window)
+        self.events = 0
+
+    def record_dispatch(self, seconds: float):
+        """Key event to hotkey callback"""
+        self.dispatch.append(seconds)
+
+    def record_event(self, seconds: float):
+        """Hook time spent on one key event"""
+        self.overhead.append(seconds)
+        self.events += 1
+
+    @staticmethod
+    def _percentile(samples, fraction: float) -> Optional[float]:
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def metrics(self) -> dict:
+        """p50/p99 in milliseconds (None without samples)"""
+        dispatch, overhead = list(self.dispatch), list(self.overhead)
+        scaled = lambda value: None if value is None else value * 1000
+        return {
+            'input_dispatch_p50_ms': scaled(self._percentile(dispatch, 0.5)),
+            'input_dispatch_p99_ms': scaled(self._percentile(dispatch, 0.99)),
+            'input_event_overhead_p50_ms': scaled(self._percentile(overhead, 0.5)),
+            'input_event_overhead_p99_ms': scaled(self._percentile(overhead, 0.99)),
+            'input_events_measured': self.events,
+        }
+
+class InputBackend:
+    """Hotkeys and keystrokes through the keyboard library, whose hook runs every key event through Python
+
+    Dispatch latency is measured from the OS timestamp of the hotkey's key
+    press. With measure_events, a passive hook also records how long each
+    event waited between the OS hook and keyboard's handlers.
+    """
+
+    name = 'keyboard'
+    # Whether hook_keys can tell synthetic key events from real ones. The
+    # keyboard library can't: it doesn't expose the flag, and on Windows it
+    # drops the VK_PACKET events write() sends without reporting them at all.
+    reports_injected = False
+    # Whether hold_input can keep real key events from the focused application
+    can_hold_input = False
+
+    def __init__(self, measure_events: bool = False):
+        self.stats = InputLatencyStats()
+        self._event_hook = keyboard.hook(self._on_event) if measure_events else None
+
+    def _on_event(self, event):
+        self.stats.record_event(max(0.0, time.time() - event.time))
+
+    def _pressed_time(self) -> Optional[float]:
+        """OS timestamp of the newest key still held (the key that completed the hotkey)"""
+        pressed = getattr(keyboard, '_pressed_events', None)
+        try:
+            return max(event.time for event in list(pressed.values())) if pressed else None
+        except (AttributeError, ValueError):
+            return None
+
+    def add_hotkey(self, hotkey: str, callback: Callable, args: tuple = ()):
+        """Register a hotkey; returns the handle for remove_hotkey"""
+        def dispatch():
+            pressed_at = self._pressed_time()
+            if pressed_at is not None:
+                self.stats.record_dispatch(max(0.0, time.time() - pressed_at))
+            callback(*args)
+        return keyboard.add_hotkey(hotkey, dispatch)
+
+    def remove_hotkey(self, handle):
+        keyboard.remove_hotkey(handle)
+
+    def hook_keys(self, callback: Callable[[str, bool, bool], None]):
+        """Call callback(key name, is key down, is injected) for every key event; returns the handle for unhook_keys
+
+        is injected is only meaningful when reports_injected is set.
+        """
+        return keyboard.hook(lambda event: callback(event.name or '', event.event_type == keyboard.KEY_DOWN, False))
+
+    def unhook_keys(self, handle):
+        keyboard.unhook(handle)
+
+    def press_and_release(self, keys: str):
+        keyboard.press_and_release(keys)
+
+    def write(self, text: str):
+        """Type text into the focused application"""
+        keyboard.write(text)
+
+    def is_pressed(self, key: str) -> bool:
+        return keyboard.is_pressed(key)
+
+    @contextmanager
+    def hold_input(self):
+        """Keep real key events from the focused application while synthetic keys are sent
+
+        Yields the list of held events, replayed when the block exits. This
+        backend can't hold input, so the list always stays empty.
+        """
+        yield []
+
+    def stop(self):
+        """Remove the measuring hook"""
+        if self._event_hook is not None:
+            keyboard.unhook(self._event_hook)
+            self._event_hook = None
+
+def to_pynput_hotkey(hotkey: str) -> str:
+    """'ctrl+shift+u' (keyboard syntax) -> '<ctrl>+<shift>+u' (pynput syntax)"""
+    if ',' in hotkey:
+        raise ValueError(f"pynput has no multi-step hotkeys: '{hotkey}'")
+    parts = []
+    for part in hotkey.lower().split('+'):
+        part = part.strip()
+        if len(part) == 1:
+            parts.append(part)
+        else:
+            parts.append(f"<{PYNPUT_KEY_NAMES.get(part, part).replace(' ', '_')}>")
+    return '+'.join(parts)
+
+class PynputInputBackend(InputBackend):
+    """pynput: one listener matches every hotkey, with no per-event work beyond that
+
+    pynput calls the listener from the OS hook itself, so the time spent in
+    it is exactly what each key event pays; it is measured on every event
+    when measure_events is set. Dispatch latency runs from the listener
+    receiving the key press to the hotkey callback starting.
+    """
+
+    name = 'pynput'
+    # Win32 flags injected events in the hook, macOS by source process;
+    # X11 doesn't mark XTest events and uinput can't tell at all
+    reports_injected = sys.platform in ('win32', 'darwin')
+    can_hold_input = sys.platform == 'win32'
+
+    def __init__(self, measure_events: bool = False):
+        # Imported here: pynput loads its platform backend on import, which needs a display on Linux
+        from pynput import keyboard as pynput_keyboard
+        super().__init__()
+        self._keyboard = pynput_keyboard
+        self._controller = pynput_keyboard.Controller()
+        self.measure_events = measure_events
+        self._hotkeys: Dict[int, object] = {}
+        self._key_hooks: Dict[int, Callable[[str, bool, bool], None]] = {}
+        self._next_handle = 0
+        self._pressed = set()
+        self._press_started = 0.0
+        self._lock = threading.Lock()
+        # (message, virtual key) of real key events held back by hold_input, or None when not holding
+        self._held_events: Optional[List[tuple]] = None
+        options = {'win32_event_filter': self._win32_filter} if self.can_hold_input else {}
+        self._listener = pynput_keyboard.Listener(on_press=self._on_press, on_release=self._on_release, **options)
+        self._listener.daemon = True
+        self._listener.start()
+
+    def _win32_filter(self, msg, data):
+        """Runs in the Windows hook: swallows real key events while input is held"""
+        held = self._held_events
+        if held is not None and not data.flags & (LLKHF_INJECTED | LLKHF_LOWER_IL_INJECTED):
+            held.append((msg, data.vkCode))
+            self._listener.suppress_event()
+        return True
+
+    def _on_press(self, key, injected: bool = False):
+        started = self._press_started = time.perf_counter()
+        if self._key_hooks:
+            name = self._key_name(key)
+            for callback in list(self._key_hooks.values()):
+                callback(name, True, injected)
+        key = self._listener.canonical(key)
+        self._pressed.add(key)
+        for hotkey in list(self._hotkeys.values()):
+            hotkey.press(key)
+        if self.measure_events:
+            self.stats.record_event(time.perf_counter() - started)
+
+    def _on_release(self, key, injected: bool = False):
+        started = time.perf_counter()
+        if self._key_hooks:
+            name = self._key_name(key)
+            for callback in list(self._key_hooks.values()):
+                callback(name, False, injected)
+        key = self._listener.canonical(key)
+        self._pressed.discard(key)
+        for hotkey in list(self._hotkeys.values()):
+            hotkey.release(key)
+        if self.measure_events:
+            self.stats.record_event(time.perf_counter() - started)
+
+    def _key_name(self, key) -> str:
+        """keyboard-library style name of a pynput key ('a', 'A', 'space', 'shift', 'windows')"""
+        char = getattr(key, 'char', None)
+        if char is not None:
+            return char
+        name = getattr(key, 'name', None)
+        if not name:
+            return ''
+        name = PYNPUT_NAMES.get(name, name)
+        return name[:-2] if name.endswith(('_l', '_r')) else name.replace('_', ' ')
+
+    def add_hotkey(self, hotkey: str, callback: Callable, args: tuple = ()):
+        """Register a hotkey; returns the handle for remove_hotkey"""
+        keys = self._keyboard.HotKey.parse(to_pynput_hotkey(hotkey))
+
+        def activate():
+            # Runs inside _on_press for the key that completed the hotkey
+            self.stats.record_dispatch(time.perf_counter() - self._press_started)
+            callback(*args)
+
+        with self._lock:
+            handle = self._next_handle
+            self._next_handle += 1
+            self._hotkeys[handle] = self._keyboard.HotKey(keys, activate)
+        return handle
+
+    def remove_hotkey(self, handle):
+        with self._lock:
+            del self._hotkeys[handle]
+
+    def hook_keys(self, callback: Callable[[str, bool, bool], None]):
+        with self._lock:
+            handle = self._next_handle
+            self._next_handle += 1
+            self._key_hooks[handle] = callback
+        return handle
+
+    def unhook_keys(self, handle):
+        with self._lock:
+            del self._key_hooks[handle]
+
+    def write(self, text: str):
+        self._controller.type(text)
+
+    def press_and_release(self, keys: str):
+        """Press a 'ctrl+v' style combination and release it in reverse order"""
+        parsed = self._keyboard.HotKey.parse(to_pynput_hotkey(keys))
+        for key in parsed:
+            self._controller.press(key)
+        for key in reversed(parsed):
+            self._controller.release(key)
+
+    def is_pressed(self, key: str) -> bool:
+        try:
+            wanted = self._keyboard.HotKey.parse(to_pynput_hotkey(key))[0]
+        except ValueError:
+            return False
+        return wanted in self._pressed
+
+    @contextmanager
+    def hold_input(self):
+        """Keep real key events from the focused application while synthetic keys are sent
+
+        Yields the list of held (message, virtual key) events. On exit they
+        are sent again in order, after everything typed inside the block;
+        being synthetic by then, key hooks see them as injected.
+        """
+        if not self.can_hold_input:
+            yield []
+            return
+        held = self._held_events = []
+        try:
+            yield held
+        finally:
+            self._held_events = None
+            for msg, vk in held:
+                key = self._keyboard.KeyCode.from_vk(vk)
+                if msg in (WM_KEYDOWN, WM_SYSKEYDOWN):
+                    self._controller.press(key)
+                else:
+                    self._controller.release(key)
+
+    def stop(self):
+        """Stop the listener"""
+        self._listener.stop()
+
+INPUT_BACKENDS = {InputBackend.name: InputBackend, PynputInputBackend.name: PynputInputBackend}
+
+def create_input_backend(name: str = DEFAULT_INPUT_BACKEND, measure_events: bool = False):
+    """The named input backend, falling back to keyboard if it can't start"""
+    backend_class = INPUT_BACKENDS.get(name)
+    if backend_class is None:
+        print(f"Unknown input backend '{name}', using {DEFAULT_INPUT_BACKEND}")
+        backend_class = InputBackend
+    try:
+        return backend_class(measure_events)
+    except Exception as e:
+        if backend_class is InputBackend:
+            raise
+        print(f"Input backend '{name}' unavailable ({e}), using {DEFAULT_INPUT_BACKEND}")
+        return InputBackend(measure_events)
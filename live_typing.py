@@ -0,0 +1,218 @@
+"""
+Live typing mode
+Uwuifies text while it is typed: each finished word is corrected in place
+with backspaces and a retype, using the same flags as the selection hotkey
+"""
+import threading
+from typing import Callable, Optional
+from hook_dispatcher import HookDispatcher
+from input_backend import InputBackend
+
+# Longer words are left as typed, which keeps every keystroke O(1)
+MAX_WORD_LENGTH = 64
+# Keys that finish a word, and the character they typed
+WORD_DELIMITERS = {'space': ' ', 'tab': '\t'}
+# Keys that don't change the text (held modifiers are tracked separately)
+IGNORED_KEYS = {'shift', 'caps lock', 'num lock', 'scroll lock', 'alt gr', 'insert'}
+# Held modifiers that turn a key into a shortcut instead of text
+SHORTCUT_MODIFIERS = {'ctrl', 'alt', 'windows'}
+
+def _base_key(name: str) -> str:
+    """'right shift' -> 'shift', 'left windows' -> 'windows'"""
+    if name.startswith(('left ', 'right ')):
+        return name.split(' ', 1)[1]
+    return name
+
+class LiveTypingTransformer:
+    """Per-keystroke word buffer that corrects each finished word as the user types
+
+    Key events only update a bounded buffer. At a word boundary the word is
+    handed to a worker thread, which transforms it with the processor's
+    current pipeline and retypes it. Anything that moves the cursor or edits
+    outside the buffer (arrows, shortcuts, backspacing past the word) leaves
+    the current word alone, so text is never corrected blind.
+
+    Our own backspaces and retyped characters come back through the hook
+    marked as injected and are ignored, so the input backend has to report
+    that flag (pynput on Windows and macOS). Real keys pressed while a
+    correction is sent are held back until it is done where the backend can
+    hold input; either way they stop tracking the word, since where they
+    landed relative to the correction isn't known.
+    """
+
+    def __init__(self, text_processor, input_backend: Optional[InputBackend] = None,
+                 on_change: Optional[Callable[[bool], None]] = None):
+        self.text_processor = text_processor
+        self.input = input_backend or InputBackend()
+        # Called with the new state whenever live typing is switched on or off
+        self.on_change = on_change
+        self.dispatcher = HookDispatcher('uwu-live')
+        self._lock = threading.Lock()
+        self._hook = None
+        # The word being typed, and whether it can still be corrected
+        self._word = []
+        self._tracked = True
+        # Context of the word for the pipeline: the delimiter before it and
+        # the word count (mod 4, for stutter)
+        self._prev = ""
+        self._words_before = 0
+        # Bumped at every word boundary; a correction only applies to the word right before it
+        self._generation = 0
+        self._held = set()
+        # Set while a correction is being typed; real keys in that window untrack the word
+        self._correcting = False
+        # Compiled transform, recompiled only when the processor's settings change
+        self._settings = None
+        self._transform = None
+        self.corrections = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._hook is not None
+
+    def start(self):
+        """Switch live typing on"""
+        if self._hook is not None:
+            return
+        if not self.input.reports_injected:
+            print(f"⚠️ Live typing needs an input backend that flags synthetic keys; "
+                  f"'{self.input.name}' doesn't on this platform")
+            return
+        self.dispatcher.start()
+        with self._lock:
+            self._reset()
+        self._hook = self.input.hook_keys(self._on_key)
+        print("✍️ Live typing on")
+        if self.on_change:
+            self.on_change(True)
+
+    def stop(self):
+        """Switch live typing off"""
+        if self._hook is None:
+            return
+        try:
+            self.input.unhook_keys(self._hook)
+        except Exception as e:
+            print(f"Error removing live typing hook: {e}")
+        self._hook = None
+        self.dispatcher.stop()
+        print("Live typing off")
+        if self.on_change:
+            self.on_change(False)
+
+    def toggle(self) -> bool:
+        """Switch live typing on or off; returns the new state"""
+        if self.enabled:
+            self.stop()
+        else:
+            self.start()
+        return self.enabled
+
+    def _reset(self):
+        """Forget the text context (caller holds the lock)"""
+        self._word = []
+        self._tracked = True
+        self._prev = ""
+        self._words_before = 0
+        self._generation += 1
+
+    def _on_key(self, name: str, down: bool, injected: bool = False):
+        """Input hook callback, for every key event: constant work per key"""
+        if injected:
+            # Our own corrections (or another program typing)
+            return
+        key = _base_key(name)
+        if key in SHORTCUT_MODIFIERS:
+            if down:
+                self._held.add(key)
+            else:
+                self._held.discard(key)
+            return
+        if not down or key in IGNORED_KEYS:
+            return
+
+        with self._lock:
+            if self._correcting:
+                # Typed in the middle of our backspaces and retype: its position is unknown
+                self._tracked = False
+            elif self._held:
+                # A shortcut (paste, undo, select all...) changed the text in ways we can't see
+                self._tracked = False
+            elif key in WORD_DELIMITERS:
+                self._end_word(WORD_DELIMITERS[key])
+            elif key == 'enter':
+                # The line is already sent/submitted; start over
+                self._reset()
+            elif key == 'backspace':
+                if self._word:
+                    self._word.pop()
+                else:
+                    self._tracked = False
+            elif len(name) == 1:
+                if len(self._word) < MAX_WORD_LENGTH:
+                    self._word.append(name)
+                else:
+                    self._tracked = False
+            else:
+                # Arrows, home/end, delete...: the cursor may no longer be after the word
+                self._tracked = False
+
+    def _end_word(self, delimiter: str):
+        """A word boundary was typed (caller holds the lock)"""
+        if self._word and self._tracked and self.text_processor.enabled:
+            word = "".join(self._word)
+            generation = self._generation + 1
+            context = (self._prev, self._words_before)
+            self.dispatcher.submit(lambda: self._correct(word, delimiter, context, generation))
+        if self._word:
+            self._words_before = (self._words_before + 1) % 4
+        self._word = []
+        self._tracked = True
+        self._prev = delimiter
+        self._generation += 1
+
+    def _pipeline(self):
+        """(pipeline, seed) for the processor's current settings"""
+        settings = self.text_processor.settings
+        if settings is not self._settings:
+            _, pipeline, seed = self.text_processor.prepare_transform(settings)
+            self._settings, self._transform = settings, (pipeline, seed)
+        return self._transform
+
+    def _correct(self, word: str, delimiter: str, context: tuple, generation: int):
+        """Worker thread: retype word (and anything typed after it) uwuified"""
+        prev, words_before = context
+        try:
+            pipeline, seed = self._pipeline()
+            transformed = pipeline(word, seed=seed, prev=prev, last=False, words_before=words_before)
+        except Exception as e:
+            print(f"Live typing transform failed: {e}")
+            return
+        if transformed == word:
+            return
+
+        with self._lock:
+            # Too late once another word was finished or the cursor moved
+            if generation != self._generation or not self._tracked:
+                return
+            tail = "".join(self._word)
+            retype = transformed + delimiter + tail
+            backspaces = len(word) + len(delimiter) + len(tail)
+            self._correcting = True
+            self.corrections += 1
+
+        failed = False
+        held = []
+        try:
+            with self.input.hold_input() as held:
+                for _ in range(backspaces):
+                    self.input.press_and_release('backspace')
+                self.input.write(retype)
+        except Exception as e:
+            print(f"Live typing correction failed: {e}")
+            failed = True
+        with self._lock:
+            self._correcting = False
+            if failed or held:
+                # Held keys are replayed as synthetic ones, which the hook ignores
+                self._tracked = False
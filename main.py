@@ -1,9 +1,11 @@
 import sys
 import os
 import subprocess
+import multiprocessing
 import time
 import threading
 from typing import Optional
+import pyperclip
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                             QHBoxLayout, QPushButton, QLabel, QDialog,
                             QLineEdit, QFormLayout, QSystemTrayIcon, QMenu, QAction)
@@ -13,10 +15,18 @@ from config_manager import ConfigManager
 from overlay import OverlayManager
 from selection_keyboard import SelectionKeyboardHook, SelectionUwuTextProcessor
 from improved_settings import ImprovedSettingsDialog
+from uwu_service import DEFAULT_ADDRESS, UwuService
+from clipboard_wait import ClipboardChangeNotifier
+from timing_profiles import TimingProfiles
+from primary_selection import PrimarySelectionSource
+from speculation import SpeculativeTransformer, SPECULATION_MAX_SIZE
+from input_backend import DEFAULT_INPUT_BACKEND, PynputInputBackend, create_input_backend
+from live_typing import LiveTypingTransformer
 
 class MainWindow(QMainWindow):
     toggle_requested = pyqtSignal()
-    overlay_requested = pyqtSignal(str)  # Signal for overlay messages
+    overlay_requested = pyqtSignal([str], [str, int])  # Overlay messages, or (message, progress %)
+    live_typing_changed = pyqtSignal(bool)
     
     def __init__(self):
         super().__init__()
@@ -24,13 +34,38 @@ class MainWindow(QMainWindow):
         
         # Connect the overlay signal to the handler
         self.overlay_requested.connect(self.show_overlay_on_main_thread)
+        self.overlay_requested[str, int].connect(self.show_progress_on_main_thread)
+        self.live_typing_changed.connect(self.on_live_typing_changed)
         self.overlay_manager = OverlayManager()
         self.text_processor = SelectionUwuTextProcessor(self.config_manager)
         self.keyboard_hook = None
+        self.live_typing = None
+        
+        # Forward clipboard change notifications to the hook thread
+        self.clipboard_notifier = ClipboardChangeNotifier()
+        QApplication.clipboard().dataChanged.connect(self.clipboard_notifier.notify)
+        # Learned copy/paste timing per application, saved next to config.json
+        self.timing_profiles = TimingProfiles(os.path.dirname(self.config_manager.config_file))
+        # Optionally transform newly copied text in the background, before the hotkey asks for it
+        self.speculation = None
+        if self.config_manager.get('speculative_transform', False):
+            self.speculation = SpeculativeTransformer(
+                self.text_processor, pyperclip.paste,
+                max_size=self.config_manager.get('speculation_max_size', SPECULATION_MAX_SIZE))
+            QApplication.clipboard().dataChanged.connect(self.speculation.notify)
+            self.speculation.start()
+        # On X11 the highlighted text can be read directly, without a synthetic ctrl+c
+        self.selection_source = None
+        if sys.platform.startswith('linux') and self.config_manager.get('primary_selection', False):
+            self.selection_source = PrimarySelectionSource()
+            if not self.selection_source.available:
+                self.selection_source = None
+        self.uwu_service = None
         
         self.setup_ui()
         self.setup_system_tray()
         self.setup_keyboard_hook()
+        self.setup_service()
         
         # Load initial state
         self.text_processor.enabled = self.config_manager.is_enabled()
@@ -310,6 +345,12 @@ class MainWindow(QMainWindow):
         self.toggle_action.triggered.connect(self.toggle_uwuifier)
         tray_menu.addAction(self.toggle_action)
         
+        # Live typing action (checked while words are uwuified as they are typed)
+        self.live_typing_action = QAction("Live typing", self)
+        self.live_typing_action.setCheckable(True)
+        self.live_typing_action.triggered.connect(self.toggle_live_typing)
+        tray_menu.addAction(self.live_typing_action)
+        
         tray_menu.addSeparator()
         
         # Settings action
@@ -339,14 +380,37 @@ class MainWindow(QMainWindow):
             # Load hotkey from config
             saved_hotkey = self.config_manager.get('hotkey', 'ctrl+shift+u')
             
+            input_backend = create_input_backend(self.config_manager.get('input_backend', DEFAULT_INPUT_BACKEND),
+                                                 self.config_manager.get('measure_input_overhead', False))
+            live_input = input_backend
+            if not input_backend.reports_injected and PynputInputBackend.reports_injected:
+                # Live typing tells its own keystrokes apart by the injected flag, which only pynput reports
+                live_input = create_input_backend(PynputInputBackend.name)
+            self.live_typing = LiveTypingTransformer(self.text_processor, live_input,
+                                                     on_change=self.live_typing_changed.emit)
             self.keyboard_hook = SelectionKeyboardHook(
                 self.text_processor, 
-                overlay_callback=self.on_overlay_trigger
+                input_backend=input_backend,
+                overlay_callback=self.on_overlay_trigger,
+                progress_callback=self.on_progress_trigger,
+                clipboard_notifier=self.clipboard_notifier,
+                clipboard_timeout=self.config_manager.get('clipboard_timeout', 0.6),
+                timing_profiles=self.timing_profiles,
+                cancel_on_press=self.config_manager.get('cancel_on_press', False),
+                selection_source=self.selection_source,
+                speculation=self.speculation,
+                live_typing=self.live_typing
             )
             
-            # Set the saved hotkey before starting
+            # Set the saved hotkeys before starting
+            self.keyboard_hook.set_history_hotkeys(self.config_manager.get('undo_hotkey', ''),
+                                                   self.config_manager.get('repaste_hotkey', ''))
+            self.keyboard_hook.set_profiles(self.config_manager.hotkey_profiles())
+            self.keyboard_hook.set_live_hotkey(self.config_manager.get('live_typing_hotkey', ''))
             self.keyboard_hook.set_hotkey(saved_hotkey)
             self.keyboard_hook.start()
+            if self.config_manager.get('live_typing', False):
+                self.live_typing.start()
             
             print(f"✅ Selection-based keyboard hook ready!")
             print(f"🔥 Use '{self.keyboard_hook.get_hotkey()}' to uwuify selected text")
@@ -361,11 +425,45 @@ class MainWindow(QMainWindow):
         
         threading.Thread(target=start_hook, daemon=True).start()
     
+    def setup_service(self):
+        """Start the local uwu service for other tools if enabled in config"""
+        if not self.config_manager.get('service_enabled', False):
+            return
+        address = self.config_manager.get('service_address') or DEFAULT_ADDRESS
+        self.uwu_service = UwuService(self.text_processor, address)
+        self.uwu_service.start()
+    
     def on_overlay_trigger(self, message: str):
         """Handle overlay trigger from keyboard hook - ensure it runs on main thread"""
         # Emit signal to show overlay on main thread
         self.overlay_requested.emit(message)
     
+    def on_progress_trigger(self, percent: Optional[int]):
+        """Handle transform progress from the keyboard hook (None when finished)"""
+        self.overlay_requested[str, int].emit("uwuifying", -1 if percent is None else percent)
+    
+    def show_progress_on_main_thread(self, message: str, percent: int):
+        """Show, update or hide the progress overlay on the main thread"""
+        try:
+            if percent < 0:
+                self.overlay_manager.hide_progress_overlay()
+            else:
+                self.overlay_manager.show_progress_overlay(f"{message}... {percent}% (esc cancels)")
+        except Exception as e:
+            print(f"Error showing progress overlay: {e}")
+    
+    def toggle_live_typing(self):
+        """Tray action: switch live typing on or off"""
+        if self.live_typing:
+            self.live_typing.toggle()
+    
+    def on_live_typing_changed(self, enabled: bool):
+        """Live typing was switched on or off: remember it and update the indicators"""
+        self.config_manager.set('live_typing', enabled)
+        self.live_typing_action.setChecked(enabled)
+        self.tray_icon.setToolTip("uwuifier - live typing ✍️" if enabled else "uwuifier")
+        self.update_toggle_button()
+    
     def show_overlay_on_main_thread(self, message: str):
         """Show overlay on the main thread"""
         try:
@@ -554,6 +652,8 @@ class MainWindow(QMainWindow):
                 self.status_label.setText(f"Status: Enabled - Use {hotkey} to uwuify!")
             else:
                 self.status_label.setText("Status: Enabled")
+            if self.live_typing and self.live_typing.enabled:
+                self.status_label.setText(self.status_label.text() + " ✍️ Live typing")
             self.toggle_action.setText("Disable uwuifier")
         else:
             self.toggle_button.setText("😿 Enable uwuifier") 
@@ -611,9 +711,36 @@ class MainWindow(QMainWindow):
     
     def close_application(self):
         """Close the entire application"""
+        # Stop live typing (keeping its saved on/off state for next launch)
+        if self.live_typing:
+            self.live_typing.on_change = None
+            self.live_typing.stop()
+            if not self.keyboard_hook or self.live_typing.input is not self.keyboard_hook.input:
+                self.live_typing.input.stop()
+        
         # Stop keyboard hook
         if self.keyboard_hook:
             self.keyboard_hook.stop()
+            # Report input latency so the cheaper input backend can be picked on this machine
+            metrics = self.keyboard_hook.metrics()
+            latency = ", ".join(f"{key}={value:.3f}" if isinstance(value, float) else f"{key}={value}"
+                                for key, value in metrics.items() if key.startswith('input_'))
+            print(f"⌨️ {latency}")
+            self.keyboard_hook.input.stop()
+        
+        # Stop the local service
+        if self.uwu_service:
+            self.uwu_service.stop()
+        
+        # Stop background speculation
+        if self.speculation:
+            self.speculation.stop()
+        
+        # Stop the transform worker processes
+        self.text_processor.shutdown()
+        
+        # Keep what we learned about app clipboard timing
+        self.timing_profiles.save()
         
         self.tray_icon.hide()
         QApplication.quit()
@@ -653,6 +780,9 @@ class UwuifierApp(QApplication):
 
 def main():
     """Main entry point"""
+    # Needed for the transform process pool in the frozen executable
+    multiprocessing.freeze_support()
+    
     app = UwuifierApp()
     
     # Check if system tray is available
@@ -92,6 +92,11 @@ class KawaiiOverlayWidget(QWidget):
         # Auto-close after duration
         QTimer.singleShot(self.duration, self.fade_out)
         
+    def set_text(self, text: str):
+        """Change the message of a visible overlay"""
+        self.text = text
+        self.update()
+    
     def update_animation(self):
         """Update animation frame"""
         self.animation_time += 1
@@ -115,6 +120,7 @@ class EnhancedOverlayManager:
     
     def __init__(self):
         self.active_overlays: List[KawaiiOverlayWidget] = []
+        self.progress_overlay: Optional[KawaiiOverlayWidget] = None
         
     def show_overlay(self, text: str, position: tuple = None, duration: int = 2000):
         """Show a beautiful kawaii overlay with animations"""
@@ -142,6 +148,29 @@ class EnhancedOverlayManager:
         except Exception as e:
             print(f"Error showing overlay: {e}")
     
+    def show_progress_overlay(self, text: str):
+        """Show a progress overlay, or update the one already showing"""
+        try:
+            if self.progress_overlay is not None:
+                self.progress_overlay.set_text(f"⏳ {text}")
+                return
+            screen = QApplication.primaryScreen().availableGeometry()
+            position = (screen.width() - 200 - 10, screen.y() + 60)  # Below the message overlays
+            # Stays up until hide_progress_overlay
+            self.progress_overlay = KawaiiOverlayWidget(f"⏳ {text}", position, 24 * 60 * 60 * 1000)
+            self.progress_overlay.show()
+        except Exception as e:
+            print(f"Error showing progress overlay: {e}")
+    
+    def hide_progress_overlay(self):
+        """Fade out the progress overlay"""
+        overlay, self.progress_overlay = self.progress_overlay, None
+        if overlay is not None:
+            try:
+                overlay.fade_out()
+            except Exception as e:
+                print(f"Error hiding progress overlay: {e}")
+    
     def remove_overlay(self, overlay):
         """Remove overlay from tracking"""
         try:
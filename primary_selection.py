@@ -0,0 +1,160 @@
+"""
+X11 PRIMARY selection source
+On Linux the highlighted text is already published as the PRIMARY selection,
+so the hook can read it without sending ctrl+c and waiting for the copy,
+as long as it belongs to the focused window's X client
+"""
+import ctypes
+import ctypes.util
+import threading
+from typing import Optional
+from PyQt5.QtCore import QObject, QTimer
+from PyQt5.QtGui import QClipboard
+from PyQt5.QtWidgets import QApplication
+
+# Selection changes arrive continuously while dragging; only read once they settle
+SELECTION_DEBOUNCE_MS = 30
+# How long the hook waits for a pending refresh before falling back to ctrl+c
+SELECTION_READ_TIMEOUT = 0.15
+XA_PRIMARY = 1
+XA_WINDOW = 33
+# X resource IDs are the owning client's base plus an index under this mask
+# (X.Org's default for 256 clients; a higher -maxclients shrinks it, which can
+# only make windows of one client look like two and fall back to ctrl+c)
+X_RESOURCE_MASK = 0x1FFFFF
+
+class X11SelectionOwner:
+    """Checks that the PRIMARY selection is owned by the X client of the focused window
+
+    Opens its own display connection on first use, so it must only be used
+    from one thread (the hook's).
+    """
+
+    def __init__(self):
+        path = ctypes.util.find_library('X11')
+        if not path:
+            raise OSError("libX11 not found")
+        self._xlib = xlib = ctypes.cdll.LoadLibrary(path)
+        xlib.XOpenDisplay.restype = ctypes.c_void_p
+        xlib.XOpenDisplay.argtypes = (ctypes.c_char_p,)
+        xlib.XDefaultRootWindow.restype = ctypes.c_ulong
+        xlib.XDefaultRootWindow.argtypes = (ctypes.c_void_p,)
+        xlib.XInternAtom.restype = ctypes.c_ulong
+        xlib.XInternAtom.argtypes = (ctypes.c_void_p, ctypes.c_char_p, ctypes.c_int)
+        xlib.XGetSelectionOwner.restype = ctypes.c_ulong
+        xlib.XGetSelectionOwner.argtypes = (ctypes.c_void_p, ctypes.c_ulong)
+        xlib.XGetWindowProperty.argtypes = (
+            ctypes.c_void_p, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_long, ctypes.c_long, ctypes.c_int,
+            ctypes.c_ulong, ctypes.POINTER(ctypes.c_ulong), ctypes.POINTER(ctypes.c_int),
+            ctypes.POINTER(ctypes.c_ulong), ctypes.POINTER(ctypes.c_ulong), ctypes.POINTER(ctypes.c_void_p))
+        xlib.XGetInputFocus.argtypes = (ctypes.c_void_p, ctypes.POINTER(ctypes.c_ulong), ctypes.POINTER(ctypes.c_int))
+        xlib.XFree.argtypes = (ctypes.c_void_p,)
+        self._display = None
+
+    def _focused_window(self) -> int:
+        """The window manager's active top-level window, or the input focus window without one"""
+        xlib, display = self._xlib, self._display
+        active = xlib.XInternAtom(display, b"_NET_ACTIVE_WINDOW", True)
+        if active:
+            actual_type, actual_format = ctypes.c_ulong(), ctypes.c_int()
+            items, after, data = ctypes.c_ulong(), ctypes.c_ulong(), ctypes.c_void_p()
+            status = xlib.XGetWindowProperty(display, xlib.XDefaultRootWindow(display), active, 0, 1, False,
+                                             XA_WINDOW, ctypes.byref(actual_type), ctypes.byref(actual_format),
+                                             ctypes.byref(items), ctypes.byref(after), ctypes.byref(data))
+            if data:
+                try:
+                    # Format 32 properties come back as C longs
+                    if status == 0 and items.value == 1:
+                        return ctypes.cast(data, ctypes.POINTER(ctypes.c_ulong))[0]
+                finally:
+                    xlib.XFree(data)
+        focus, revert = ctypes.c_ulong(), ctypes.c_int()
+        xlib.XGetInputFocus(display, ctypes.byref(focus), ctypes.byref(revert))
+        # None (0) and PointerRoot (1) aren't windows
+        return focus.value if focus.value > 1 else 0
+
+    def owned_by_focus(self) -> bool:
+        """Whether PRIMARY's owner window and the focused window belong to the same X client"""
+        if self._display is None:
+            self._display = self._xlib.XOpenDisplay(None)
+            if not self._display:
+                raise OSError("cannot open the X display")
+        owner = self._xlib.XGetSelectionOwner(self._display, XA_PRIMARY)
+        focused = self._focused_window()
+        return bool(owner and focused) and owner & ~X_RESOURCE_MASK == focused & ~X_RESOURCE_MASK
+
+class PrimarySelectionSource(QObject):
+    """Mirrors the PRIMARY selection for the hook thread
+
+    QClipboard may only be used on the GUI thread, so the text is refreshed
+    there (debounced on selectionChanged) and handed over through a cache.
+    Without a way to check PRIMARY's owner it stays unavailable.
+    """
+
+    def __init__(self, clipboard: Optional[QClipboard] = None, debounce_ms: int = SELECTION_DEBOUNCE_MS):
+        super().__init__()
+        self.clipboard = clipboard or QApplication.clipboard()
+        # Only X11 (and XWayland) platforms have a PRIMARY selection
+        self.available = self.clipboard.supportsSelection()
+        self._owner = None
+        if self.available:
+            try:
+                self._owner = X11SelectionOwner()
+            except OSError as e:
+                print(f"PRIMARY selection disabled, its owner can't be checked: {e}")
+                self.available = False
+        self.changes = 0
+        self._text = ""
+        self._dirty = False
+        self._condition = threading.Condition()
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(debounce_ms)
+        self._timer.timeout.connect(self._refresh)
+        # Not filled at startup: PRIMARY keeps text whose selection may be long gone
+        if self.available:
+            self.clipboard.selectionChanged.connect(self._on_selection_changed)
+
+    def _on_selection_changed(self):
+        """GUI thread: the selection moved, refresh once it settles"""
+        with self._condition:
+            self._dirty = True
+        self._timer.start()
+
+    def _refresh(self):
+        """GUI thread: read the PRIMARY selection into the cache"""
+        try:
+            text = self.clipboard.text(QClipboard.Selection)
+        except Exception as e:
+            print(f"Could not read the PRIMARY selection: {e}")
+            text = ""
+        with self._condition:
+            self._text = text
+            self._dirty = False
+            self.changes += 1
+            self._condition.notify_all()
+
+    def read(self, timeout: float = SELECTION_READ_TIMEOUT) -> Optional[str]:
+        """Hook thread: the highlighted text, or None when PRIMARY is unavailable or empty
+
+        Each selection change is handed out at most once. PRIMARY keeps the
+        last highlighted text after the selection is gone, so a second press
+        (or a press with nothing newly selected) falls back to ctrl+c, and so
+        does a selection made in another window than the focused one.
+        """
+        if not self.available:
+            return None
+        with self._condition:
+            if not self._condition.wait_for(lambda: not self._dirty, timeout):
+                return None
+            text, self._text = self._text, ""
+        if not text:
+            return None
+        try:
+            if not self._owner.owned_by_focus():
+                return None
+        except OSError as e:
+            print(f"PRIMARY selection disabled, its owner can't be checked: {e}")
+            self.available = False
+            return None
+        return text
@@ -0,0 +1,86 @@
+"""
+Result cache for the text processor
+Memory-bounded LRU cache of uwuified text keyed by content digest and flags
+"""
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+from typing import Optional, Hashable
+
+
+class TransformResultCache:
+    """LRU cache limited by the total size of the cached results in bytes"""
+
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024, max_entry_fraction: float = 0.125):
+        self.max_bytes = max_bytes
+        # Results bigger than this are never admitted, so a huge one-off
+        # selection can't flush the small entries that actually get reused
+        self.max_entry_bytes = int(max_bytes * max_entry_fraction)
+        self._entries = OrderedDict()  # key -> (result, size)
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.rejections = 0
+
+    @staticmethod
+    def make_key(text: str, flags: Hashable) -> tuple:
+        """Build a cache key from a digest of the text and the flag snapshot"""
+        digest = hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+        return (digest, len(text), flags)
+
+    def accepts(self, text: str) -> bool:
+        """Whether a result for text is small enough to be worth hashing and caching"""
+        return sys.getsizeof(text) <= self.max_entry_bytes
+
+    def get(self, key: tuple) -> Optional[str]:
+        """Return the cached result for key and mark it recently used"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: tuple, result: str):
+        """Store a result, evicting least recently used entries to stay under the byte limit"""
+        size = sys.getsizeof(result)
+        with self._lock:
+            if size > self.max_entry_bytes:
+                self.rejections += 1
+                return
+
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old[1]
+
+            while self._entries and self.current_bytes + size > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+
+            self._entries[key] = (result, size)
+            self.current_bytes += size
+
+    def clear(self):
+        """Drop every cached result"""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self) -> dict:
+        """Counters for monitoring the cache"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'rejections': self.rejections,
+            }
@@ -4,51 +4,151 @@ Uses a customizable shortcut to uwuify currently selected text
 """
 import threading
 import time
-from typing import Optional, Callable
-import uwuify
-import keyboard
-import pyperclip
+import unicodedata
+from typing import Dict, Iterable, NamedTuple, Optional, Callable, Tuple
+from clipboard_backend import ClipboardBackend, create_clipboard_backend
+from clipboard_wait import (ClipboardChangeNotifier, DEFAULT_CLIPBOARD_TIMEOUT,
+                            wait_for_clipboard_change, wait_until)
+from config_manager import TransformSettings
+from hook_dispatcher import HookDispatcher
+from hotkey_registry import HotkeyRegistry
+from input_backend import InputBackend
+from text_processor import SelectionUwuTextProcessor
+from timing_profiles import ClipboardTiming, TimingProfiles, DEFAULT_APP
+from transform_history import TransformHistory
 
-class SelectionUwuTextProcessor:
-    """Processes selected text through uwuifier"""
+# Seconds before the user's clipboard comes back after a paste
+CLIPBOARD_RESTORE_DELAY = 3.0
+# Per hotkey, a running job plus at most one follow-up; further presses are coalesced into it
+MAX_PENDING_JOBS = 2
+# Selections at least this long show a progress overlay and can be cancelled with CANCEL_KEY
+PROGRESS_THRESHOLD = 256 * 1024
+# Minimum seconds between progress overlay updates
+PROGRESS_INTERVAL = 0.2
+CANCEL_KEY = 'esc'
+# Characters of selected/uwuified text shown in the console log
+LOG_PREVIEW_LENGTH = 200
+# Hotkey modifiers that would turn our ctrl+c into e.g. ctrl+shift+c while still held
+RELEASE_MODIFIERS = ('shift', 'alt', 'windows')
+MODIFIER_RELEASE_TIMEOUT = 0.3
+# Undo selects the pasted text back with shift+left up to this many characters;
+# longer pastes (and text select-back can't count) are undone with the application's own ctrl+z
+UNDO_SELECT_LIMIT = 4096
+ZWJ = '\u200d'
+# Code point ranges that stay in the cluster of the character before them:
+# variation selectors, emoji skin tone modifiers and tag characters
+CLUSTER_EXTENDERS = ((0xFE00, 0xFE0F), (0x1F3FB, 0x1F3FF), (0xE0020, 0xE007F))
+REGIONAL_INDICATORS = (0x1F1E6, 0x1F1FF)
+# Hangul jamo compose into syllables by rules caret_steps doesn't model
+HANGUL_JAMO = ((0x1100, 0x11FF), (0xA960, 0xA97F), (0xD7B0, 0xD7FF))
+
+def _in_ranges(code: int, ranges) -> bool:
+    return any(low <= code <= high for low, high in ranges)
+
+def caret_steps(text: str) -> Optional[int]:
+    """Caret moves (shift+left presses) across text, one per grapheme cluster, or None if unsure
     
-    def __init__(self, config_manager=None):
-        self.enabled = True
-        self.config_manager = config_manager
-        
-    def process_text(self, text: str) -> str:
-        """Process text through uwuifier with configured flags"""
-        if not text.strip():
-            return text
-            
-        try:
-            # Get uwuify flags from config
-            flags = uwuify.UwuifyFlag.NONE
-            
-            if self.config_manager:
-                if self.config_manager.get('smiley', False):
-                    flags |= uwuify.UwuifyFlag.SMILEY
-                if self.config_manager.get('yu', False):
-                    flags |= uwuify.UwuifyFlag.YU
-                if self.config_manager.get('stutter', False):
-                    flags |= uwuify.UwuifyFlag.STUTTER
-                if self.config_manager.get('nouwu', False):
-                    flags |= uwuify.UwuifyFlag.NOUWU
-            
-            # Use uwuify to transform the text with flags
-            return uwuify.uwu(text, flags=flags)
-        except Exception:
-            return text
+    Combining marks, variation selectors, skin tones and ZWJ sequences stay
+    with the character before them, regional indicators pair up into flags,
+    and CRLF is one step.
+    """
+    steps = 0
+    previous = ''
+    pending_flag = False
+    for char in text:
+        code = ord(char)
+        if _in_ranges(code, HANGUL_JAMO):
+            return None
+        extends = (previous == ZWJ or char == ZWJ or (previous == '\r' and char == '\n')
+                   or unicodedata.category(char) in ('Mn', 'Me', 'Mc')
+                   or _in_ranges(code, CLUSTER_EXTENDERS))
+        regional = REGIONAL_INDICATORS[0] <= code <= REGIONAL_INDICATORS[1]
+        if regional and pending_flag:
+            extends = True
+            pending_flag = False
+        else:
+            pending_flag = regional and not extends
+        if not extends or not steps:
+            steps += 1
+        previous = char
+    return steps
+
+def preview(text: str) -> str:
+    """Shorten text for logging, so huge selections don't flood the console"""
+    if len(text) <= LOG_PREVIEW_LENGTH:
+        return text
+    return f"{text[:LOG_PREVIEW_LENGTH]}... ({len(text)} characters)"
+
+class HotkeyProfile(NamedTuple):
+    """A named flag profile bound to its own hotkey"""
+    name: str
+    hotkey: str
+    # Prepared (settings, pipeline, seed) from SelectionUwuTextProcessor.prepare_transform
+    transform: tuple
 
 class SelectionKeyboardHook:
     """Keyboard hook that uwuifies selected text when shortcut is pressed"""
     
-    def __init__(self, text_processor: SelectionUwuTextProcessor, overlay_callback: Optional[Callable] = None):
+    def __init__(self, text_processor: SelectionUwuTextProcessor, overlay_callback: Optional[Callable] = None,
+                 clipboard_notifier: Optional[ClipboardChangeNotifier] = None,
+                 clipboard_timeout: float = DEFAULT_CLIPBOARD_TIMEOUT,
+                 timing_profiles: Optional[TimingProfiles] = None,
+                 clipboard_backend: Optional[ClipboardBackend] = None,
+                 dispatcher: Optional[HookDispatcher] = None,
+                 cancel_on_press: bool = False,
+                 selection_source=None,
+                 progress_callback: Optional[Callable[[Optional[int]], None]] = None,
+                 speculation=None,
+                 history: Optional[TransformHistory] = None,
+                 hotkeys: Optional[HotkeyRegistry] = None,
+                 input_backend: Optional[InputBackend] = None,
+                 live_typing=None):
         self.text_processor = text_processor
         self.overlay_callback = overlay_callback
+        # Receives transform progress in percent for large selections, then None when done
+        self.progress_callback = progress_callback
+        # Optional change notifications (QClipboard.dataChanged) to wake up clipboard waits
+        self.clipboard_notifier = clipboard_notifier
+        # Global hotkeys and synthetic keystrokes (keyboard or pynput), with latency stats
+        self.input = input_backend or InputBackend()
+        # Clipboard access, change counter and copy/paste keystrokes (swappable for benchmarks)
+        self.clipboard = clipboard_backend or create_clipboard_backend(clipboard_notifier, self.input)
+        # Upper bound on how long to wait for a copy or paste to land
+        self.clipboard_timeout = clipboard_timeout
+        # Learned per-application timing; fixed defaults without it
+        self.timing_profiles = timing_profiles
+        # Optional source of the highlighted text that avoids ctrl+c (X11 PRIMARY selection)
+        self.selection_source = selection_source
+        # Optional SpeculativeTransformer holding results for recently copied text
+        self.speculation = speculation
+        # Optional LiveTypingTransformer, switched on and off with live_hotkey
+        self.live_typing = live_typing
+        # Recent transforms for the undo and re-paste hotkeys
+        self.history = history if history is not None else TransformHistory()
+        # Our hotkey bindings, changed one at a time by handle
+        self.hotkeys = hotkeys or HotkeyRegistry(self.input)
+        # Runs hotkey jobs and delayed clipboard restores on one long-lived thread
+        self.dispatcher = dispatcher or HookDispatcher()
+        self._restore_timer = None
+        # Snapshot of the user's clipboard, held until it has been restored, and
+        # the clipboard's change count right after it was taken
+        self._restore_original = None
+        self._original_count = None
+        # Press bookkeeping: jobs queued or running per hotkey, and the running job's cancel flag
+        self._press_lock = threading.Lock()
+        self._pending_jobs: Dict[str, int] = {}
+        self._transforming = False
+        self._cancel_event = threading.Event()
+        # Whether a press during a running transform cancels it instead of queueing a follow-up
+        self.cancel_on_press = cancel_on_press
+        self.presses_coalesced = 0
         self.running = False
         self.hotkey = 'ctrl+shift+u'  # Default shortcut
-        self.processing = False
+        self.undo_hotkey: Optional[str] = None  # Pastes back the original of the last uwuify
+        self.repaste_hotkey: Optional[str] = None  # Pastes the last result again
+        self.live_hotkey: Optional[str] = None  # Toggles live typing
+        # Extra hotkeys that uwuify with their own flags instead of the current settings
+        self.profiles: Tuple[HotkeyProfile, ...] = ()
         
     def start(self):
         """Start the keyboard hook"""
@@ -56,16 +156,14 @@ class SelectionKeyboardHook:
             return
             
         self.running = True
+        self.dispatcher.start()
         
         try:
-            # Set up hotkey for uwuifying selected text
-            try:
-                keyboard.add_hotkey(self.hotkey, self._uwuify_selection)
-                print(f"UwUify shortcut '{self.hotkey}' set up successfully")
-            except Exception as hotkey_error:
-                print(f"Error setting hotkey: {hotkey_error}")
+            # Set up hotkeys for uwuifying selected text and the history
+            self._register_hotkeys()
             
             print("Selection-based keyboard hook started successfully")
+            print(f"Clipboard change detection: {self.clipboard.name}")
             
         except Exception as e:
             print(f"Failed to start keyboard hook: {e}")
@@ -74,120 +172,455 @@ class SelectionKeyboardHook:
     def stop(self):
         """Stop the keyboard hook"""
         self.running = False
+        # Only our own bindings; other hooks in the process (troll mode) stay
+        self.hotkeys.unbind_all()
+        print("Keyboard hook stopped")
+        
+        # Put the user's clipboard back now rather than dropping the pending restore
+        if self._restore_timer and self.dispatcher.cancel(self._restore_timer):
+            self._restore_clipboard()
+        self.dispatcher.stop()
+    
+    def _register_hotkeys(self):
+        """Bring the registry in line with the uwuify, undo/re-paste and profile hotkeys
+        
+        Unchanged bindings are left alone and changed ones are swapped in
+        place, so the other hotkeys keep working throughout.
+        """
+        wanted = {'uwuify': (self.hotkey, self._on_hotkey, ())}
+        if self.undo_hotkey:
+            wanted['undo'] = (self.undo_hotkey, self._on_undo_hotkey, ())
+        if self.repaste_hotkey:
+            wanted['repaste'] = (self.repaste_hotkey, self._on_repaste_hotkey, ())
+        if self.live_hotkey and self.live_typing:
+            wanted['live'] = (self.live_hotkey, self._on_live_hotkey, ())
+        for profile in self.profiles:
+            wanted[f'profile:{profile.name}'] = (profile.hotkey, self._on_profile_hotkey, (profile,))
+        self.hotkeys.sync(wanted)
+        print(f"Hotkeys: {', '.join(f'{name}={self.hotkeys.hotkey(name)}' for name in wanted)}")
+    
+    def trigger(self):
+        """Run the shortcut's action as if it had been pressed"""
+        self._on_hotkey()
+    
+    def _on_hotkey(self):
+        """Hotkey callback: hand the work to the dispatcher so the hook thread returns immediately"""
+        self._queue(self._uwuify_selection, self.hotkey, cancels=True)
+    
+    def _on_profile_hotkey(self, profile: HotkeyProfile):
+        """Profile hotkey callback: same as the main hotkey, with the profile's ready pipeline"""
+        self._queue(lambda hotkey: self._uwuify_selection(hotkey, profile), profile.hotkey, cancels=True)
+    
+    def _on_undo_hotkey(self):
+        """Undo hotkey callback"""
+        self._queue(self._undo_last, self.undo_hotkey)
+    
+    def _on_repaste_hotkey(self):
+        """Re-paste hotkey callback"""
+        self._queue(self._repaste_last, self.repaste_hotkey)
+    
+    def _on_live_hotkey(self):
+        """Live typing hotkey callback: (un)hooking keys is left to the dispatcher thread"""
+        self.dispatcher.submit(self._toggle_live_typing)
+    
+    def _toggle_live_typing(self):
+        """Switch live typing on or off"""
+        enabled = self.live_typing.toggle()
+        if self.overlay_callback:
+            if not self.live_typing.input.reports_injected:
+                self.overlay_callback("live typing unavailable here 😿")
+            else:
+                self.overlay_callback("live typing on ✍️" if enabled else "live typing off 💤")
+    
+    def _queue(self, action: Callable[[str], None], hotkey: str, cancels: bool = False):
+        """Queue a job for a hotkey press
+        
+        Repeated presses of one hotkey while its job runs collapse into at
+        most one follow-up job, or cancel the running transform when
+        cancel_on_press is set. Other hotkeys queue their own jobs.
+        """
+        with self._press_lock:
+            if cancels and self.cancel_on_press and self._transforming:
+                self._cancel_event.set()
+                message = "uwuify cancelled ⏹️"
+            elif self._pending_jobs.get(hotkey, 0) >= MAX_PENDING_JOBS:
+                self.presses_coalesced += 1
+                message = "already queued, press merged 🔁"
+            else:
+                self._pending_jobs[hotkey] = self._pending_jobs.get(hotkey, 0) + 1
+                message = None
+        
+        if message:
+            print(message)
+            if self.overlay_callback:
+                self.overlay_callback(message)
+            return
+        
+        if not self.dispatcher.submit(lambda: self._run_job(action, hotkey)):
+            self._job_done(hotkey)
+            print("⚠️ Hook dispatcher is not running")
+    
+    def _run_job(self, action: Callable[[str], None], hotkey: str):
+        """Dispatcher job for one (possibly coalesced) press"""
         try:
-            keyboard.unhook_all()
-            print("Keyboard hook stopped")
-        except:
-            pass
+            action(hotkey)
+        finally:
+            self._job_done(hotkey)
     
-    def _uwuify_selection(self):
-        """UwUify the currently selected text"""
+    def _job_done(self, hotkey: str):
+        with self._press_lock:
+            remaining = self._pending_jobs.get(hotkey, 0) - 1
+            if remaining > 0:
+                self._pending_jobs[hotkey] = remaining
+            else:
+                self._pending_jobs.pop(hotkey, None)
+    
+    def _uwuify_selection(self, hotkey: str, profile: Optional[HotkeyProfile] = None):
+        """UwUify the currently selected text, with the current settings or a profile's"""
         if not self.text_processor.enabled:
             # Show overlay for disabled state
             if self.overlay_callback:
                 self.overlay_callback("uwuifier is disabled 😿")
             return
         
-        # Prevent rapid multiple calls
-        if self.processing:
-            return
-            
-        self.processing = True
-        
         try:
             print("🔄 Processing selected text...")
             
-            # Store current clipboard content
-            try:
-                original_clipboard = pyperclip.paste()
-            except:
-                original_clipboard = ""
+            self._save_clipboard()
+            app, timing = self._timing()
             
-            # Longer wait for clipboard operations to work across more apps
-            time.sleep(0.05)
+            # Let go of hotkey modifiers first so ctrl+c/ctrl+v aren't sent as e.g. ctrl+shift+c
+            self._wait_for_modifier_release(hotkey)
             
-            # Copy selected text to clipboard with multiple attempts
-            selected_text = ""
-            for attempt in range(3):
-                keyboard.press_and_release('ctrl+c')
-                time.sleep(0.15)  # Increased wait time
-                
-                # Get the selected text
-                try:
-                    selected_text = pyperclip.paste()
-                except:
-                    selected_text = ""
-                
-                # Check if we got new text (different from original clipboard)
-                if selected_text and selected_text != original_clipboard:
-                    break
-                    
-                if attempt == 2:  # Last attempt failed
-                    print("⚠️ No text selected or clipboard unchanged after 3 attempts")
-                    if self.overlay_callback:
-                        self.overlay_callback("no text selected ⚠️")
-                    return
+            # The highlighted text is already published on X11; otherwise copy it
+            selected_text = self.selection_source.read() if self.selection_source else None
+            if selected_text is not None:
+                print("📋 Using the PRIMARY selection")
+            elif self.speculation:
+                with self.speculation.hook_copy():
+                    selected_text = self._copy_selection(timing, app)
+            else:
+                selected_text = self._copy_selection(timing, app)
+            
+            if selected_text is None:
+                print(f"⚠️ No text selected or clipboard unchanged after {timing.attempts} attempts")
+                if self.overlay_callback:
+                    self.overlay_callback("no text selected ⚠️")
+                return
             
-            print(f"📝 Selected text: '{selected_text}'")
+            print(f"📝 Selected text: '{preview(selected_text)}'")
             
             # UwUify the text using the library function on the WHOLE text
-            uwuified_text = self.text_processor.process_text(selected_text)
+            transform = profile.transform if profile else None
+            uwuified_text = self._transform(selected_text, transform)
             
-            print(f"🦄 UwUified text: '{uwuified_text}'")
+            if uwuified_text is None:
+                # Cancelled by a press or Escape; put back what we overwrote with the copy
+                self._restore_clipboard()
+                return
             
-            # Put uwuified text in clipboard
-            pyperclip.copy(uwuified_text)
-            time.sleep(0.1)  # Wait for clipboard to be set
+            print(f"🦄 UwUified text: '{preview(uwuified_text)}'")
             
             # Paste the uwuified text (replaces selection)
-            keyboard.press_and_release('ctrl+v')
+            self._paste(uwuified_text, timing)
+            settings = transform[0] if transform else self.text_processor.settings
+            self.history.add(selected_text, uwuified_text, settings[1:])
             
             # Show success overlay
             if self.overlay_callback:
-                self.overlay_callback("text uwuified ✅")
-            
-            # Restore original clipboard after a delay (silently)
-            def restore_clipboard():
-                time.sleep(3)
-                try:
-                    pyperclip.copy(original_clipboard)
-                except:
-                    pass
-            
-            threading.Thread(target=restore_clipboard, daemon=True).start()
+                self.overlay_callback(f"text uwuified ({profile.name}) ✅" if profile else "text uwuified ✅")
             
         except Exception as e:
             print(f"Error processing selection: {e}")
             if self.overlay_callback:
                 self.overlay_callback("error uwuifying text ❌")
         finally:
-            # Use a longer delay to prevent rapid successive calls
-            def reset_processing():
-                time.sleep(1.0)  # Longer delay to prevent multiple rapid calls
-                self.processing = False
-            
-            threading.Thread(target=reset_processing, daemon=True).start()
+            self._finish_clipboard()
     
-    def set_hotkey(self, new_hotkey: str):
-        """Update the hotkey"""
+    def _undo_last(self, hotkey: str):
+        """Replace the last uwuified text, still right before the caret, with its original and forget it"""
+        entry = self.history.last()
+        if entry is None:
+            if self.overlay_callback:
+                self.overlay_callback("nothing to undo 🤷")
+            return
+        steps = caret_steps(entry.transformed)
+        if steps is None or steps > UNDO_SELECT_LIMIT:
+            self._undo_in_app(hotkey)
+        elif self._paste_from_history(entry.original, hotkey, "uwuify undone ↩️", select_back=steps):
+            self.history.pop()
+    
+    def _undo_in_app(self, hotkey: str):
+        """Undo the last paste with the application's own ctrl+z
+        
+        That already puts the original back, so nothing is pasted after it.
+        """
         try:
-            # Remove old hotkey
-            try:
-                keyboard.unhook_all_hotkeys()
-            except AttributeError:
-                keyboard.unhook_all()
-            
-            self.hotkey = new_hotkey
-            
-            # Add new hotkey
+            self._wait_for_modifier_release(hotkey)
+            self.input.press_and_release('ctrl+z')
+            self.history.pop()
+            print("uwuify undone in the application ↩️")
+            if self.overlay_callback:
+                self.overlay_callback("uwuify undone ↩️")
+        except Exception as e:
+            print(f"Error undoing: {e}")
+            if self.overlay_callback:
+                self.overlay_callback("error undoing ❌")
+    
+    def _repaste_last(self, hotkey: str):
+        """Paste the last uwuified text again, without copying or transforming"""
+        entry = self.history.last()
+        if entry is None:
+            if self.overlay_callback:
+                self.overlay_callback("nothing to paste yet 🤷")
+            return
+        self._paste_from_history(entry.transformed, hotkey, "pasted again 📋")
+    
+    def _paste_from_history(self, text: str, hotkey: str, message: str, select_back: int = 0) -> bool:
+        """Paste a history text over the current selection, or over the select_back
+        grapheme clusters just before the caret
+        
+        Returns whether it was pasted.
+        """
+        try:
+            self._save_clipboard()
+            _, timing = self._timing()
+            self._wait_for_modifier_release(hotkey)
+            for _ in range(select_back):
+                # Nothing is selected after a paste; select the pasted text back first
+                self.input.press_and_release('shift+left')
+            self._paste(text, timing)
+            print(message)
+            if self.overlay_callback:
+                self.overlay_callback(message)
+            return True
+        except Exception as e:
+            print(f"Error pasting from history: {e}")
+            if self.overlay_callback:
+                self.overlay_callback("error pasting text ❌")
+            return False
+        finally:
+            self._finish_clipboard()
+    
+    def _save_clipboard(self):
+        """Snapshot every clipboard format before taking the clipboard over
+        
+        If the previous paste's restore is still pending, the clipboard holds
+        our own output, so that restore's snapshot is kept instead.
+        """
+        if not (self._restore_timer and self.dispatcher.cancel(self._restore_timer)):
+            self._release_original()
             try:
-                keyboard.add_hotkey(self.hotkey, self._uwuify_selection)
-                print(f"Hotkey updated to: {new_hotkey}")
-            except Exception as hotkey_error:
-                print(f"Hotkey setup error: {hotkey_error}")
-            
+                self._restore_original = self.clipboard.snapshot()
+                self._original_count = self.clipboard.change_count()
+                if self._restore_original.missing:
+                    print(f"Clipboard formats {self._restore_original.missing} couldn't be saved and won't be restored")
+                    if self.overlay_callback:
+                        self.overlay_callback("clipboard only partly saved ⚠️")
+            except Exception as e:
+                print(f"Could not save the clipboard: {e}")
+        self._restore_timer = None
+    
+    def _finish_clipboard(self):
+        """End of a job that scheduled no restore: put the user's clipboard back if it changed
+        
+        The snapshot may be one kept from a previous paste whose restore was
+        cancelled, so it must never be dropped while our text is on the clipboard.
+        """
+        if self._restore_timer is not None or self._restore_original is None:
+            return
+        try:
+            unchanged = self.clipboard.change_count() == self._original_count
+        except Exception:
+            unchanged = False
+        if unchanged:
+            self._release_original()
+        else:
+            self._restore_clipboard()
+    
+    def _timing(self):
+        """(app, timing) for the application we're about to copy from / paste into"""
+        app = self.clipboard.foreground_app() if self.timing_profiles else DEFAULT_APP
+        if self.timing_profiles:
+            return app, self.timing_profiles.timing_for(app, self.clipboard_timeout)
+        return app, ClipboardTiming(attempt_timeout=self.clipboard_timeout / ClipboardTiming().attempts,
+                                    paste_timeout=self.clipboard_timeout)
+    
+    def _paste(self, text: str, timing: ClipboardTiming):
+        """Put text on the clipboard, paste it, and schedule the clipboard restore"""
+        # Wait until the clipboard is readable before pasting
+        since = self.clipboard.change_count()
+        self.clipboard.copy(text)
+        wait_for_clipboard_change(self.clipboard.change_count, since, timing.paste_timeout,
+                                  self.clipboard_notifier, timing.initial_interval)
+        
+        self.clipboard.send_paste()
+        
+        # Restore original clipboard after a delay (silently)
+        self._restore_timer = self.dispatcher.schedule(CLIPBOARD_RESTORE_DELAY, self._restore_clipboard)
+    
+    def _transform(self, text: str, transform: Optional[tuple] = None) -> Optional[str]:
+        """Transform text (with the current settings or a prepared transform), returning None if cancelled
+        
+        Large selections report throttled progress and listen for Escape
+        while they run.
+        """
+        large = len(text) >= PROGRESS_THRESHOLD
+        progress = None
+        with self._press_lock:
+            self._cancel_event.clear()
+            self._transforming = True
+        try:
+            if large:
+                if not self.hotkeys.bind('cancel', CANCEL_KEY, self._cancel_transform):
+                    print(f"Could not listen for {CANCEL_KEY}")
+                if self.progress_callback:
+                    progress = self._progress_reporter()
+                    self.progress_callback(0)
+            # Copied text may already have been transformed in the background
+            result = None
+            if self.speculation:
+                result = self.speculation.take(text, self._cancel_event, transform[0] if transform else None)
+            if result is None and not self._cancel_event.is_set():
+                result = self.text_processor.process_text_cancellable(text, self._cancel_event, progress,
+                                                                      transform)
+            if result is not None and self.speculation:
+                self.speculation.note_output(result)
+            return result
+        finally:
+            with self._press_lock:
+                self._transforming = False
+            if large:
+                self.hotkeys.unbind('cancel')
+                if self.progress_callback:
+                    self.progress_callback(None)
+    
+    def _progress_reporter(self) -> Callable[[int, int], None]:
+        """Progress callback for the processor, throttled to PROGRESS_INTERVAL"""
+        last_report = [time.monotonic()]
+        
+        def report(done: int, total: int):
+            now = time.monotonic()
+            if now - last_report[0] >= PROGRESS_INTERVAL and done < total:
+                last_report[0] = now
+                self.progress_callback(done * 100 // total)
+        
+        return report
+    
+    def _cancel_transform(self):
+        """Escape pressed: cancel the running transform"""
+        with self._press_lock:
+            if not self._transforming or self._cancel_event.is_set():
+                return
+            self._cancel_event.set()
+        print("uwuify cancelled ⏹️")
+        if self.overlay_callback:
+            self.overlay_callback("uwuify cancelled ⏹️")
+    
+    def _copy_selection(self, timing: ClipboardTiming, app: str) -> Optional[str]:
+        """Send ctrl+c and return the copied text, or None if nothing was copied"""
+        # The change counter tells us when the copy lands,
+        # even if the selection matches what was already on the clipboard
+        copied = False
+        for attempt in range(timing.attempts):
+            since = self.clipboard.change_count()
+            copy_started = time.perf_counter()
+            self.clipboard.send_copy()
+            copied = wait_for_clipboard_change(self.clipboard.change_count, since, timing.attempt_timeout,
+                                               self.clipboard_notifier, timing.initial_interval)
+            if copied:
+                break
+        
+        if self.timing_profiles:
+            copy_time = time.perf_counter() - copy_started if copied else None
+            self.timing_profiles.record_copy(app, copy_time, attempt)
+        
+        # Read the payload once, after the copy is known to have happened
+        if not copied:
+            return None
+        try:
+            return self.clipboard.paste() or None
+        except Exception:
+            return None
+    
+    def _restore_clipboard(self):
+        """Put the user's original clipboard back and free the snapshot"""
+        snapshot, self._restore_original = self._restore_original, None
+        self._restore_timer = None
+        if snapshot is None:
+            return
+        try:
+            self.clipboard.restore(snapshot)
         except Exception as e:
-            print(f"Error setting hotkey: {e}")
+            print(f"Could not restore the clipboard: {e}")
+        finally:
+            snapshot.release()
+    
+    def _release_original(self):
+        """Drop the saved clipboard without restoring it"""
+        snapshot, self._restore_original = self._restore_original, None
+        if snapshot is not None:
+            snapshot.release()
+    
+    def metrics(self) -> dict:
+        """Dispatcher queue depth, timers and thread counts, plus press coalescing"""
+        metrics = self.dispatcher.metrics()
+        with self._press_lock:
+            metrics['pending_jobs'] = sum(self._pending_jobs.values())
+        metrics['presses_coalesced'] = self.presses_coalesced
+        metrics['input_backend'] = self.input.name
+        metrics.update(self.input.stats.metrics())
+        return metrics
+    
+    def _wait_for_modifier_release(self, hotkey: str):
+        """Wait (briefly) until the hotkey's extra modifiers are released"""
+        held = [key for key in RELEASE_MODIFIERS if key in hotkey.split('+')]
+        if not held:
+            return
+        
+        def released() -> bool:
+            try:
+                return not any(self.clipboard.is_pressed(key) for key in held)
+            except Exception:
+                return True
+        
+        wait_until(released, MODIFIER_RELEASE_TIMEOUT)
+    
+    def set_hotkey(self, new_hotkey: str):
+        """Update the hotkey (swapped in place while the hook runs)"""
+        old_hotkey, self.hotkey = self.hotkey, new_hotkey
+        if self.running:
+            self._register_hotkeys()
+            if self.hotkeys.hotkey('uwuify') != new_hotkey:
+                # The old binding is still active; keep reporting it
+                self.hotkey = old_hotkey
+                print(f"Error setting hotkey: keeping '{old_hotkey}'")
+                return
+        print(f"Hotkey updated to: {new_hotkey}")
+    
+    def set_profiles(self, profiles: Iterable[Tuple[str, str, TransformSettings]]):
+        """Bind named flag profiles, given as (name, hotkey, settings)
+        
+        Each profile's pipeline is compiled here, so a press only dispatches
+        to a ready transform.
+        """
+        self.profiles = tuple(HotkeyProfile(name, hotkey, self.text_processor.prepare_transform(settings))
+                              for name, hotkey, settings in profiles)
+        if self.running:
+            self._register_hotkeys()
+    
+    def set_history_hotkeys(self, undo_hotkey: Optional[str], repaste_hotkey: Optional[str]):
+        """Update the undo and re-paste hotkeys (None or "" disables one)"""
+        self.undo_hotkey = undo_hotkey or None
+        self.repaste_hotkey = repaste_hotkey or None
+        if self.running:
+            self._register_hotkeys()
+    
+    def set_live_hotkey(self, live_hotkey: Optional[str]):
+        """Update the live typing toggle hotkey (None or "" disables it)"""
+        self.live_hotkey = live_hotkey or None
+        if self.running:
+            self._register_hotkeys()
     
     def get_hotkey(self):
         return self.hotkey
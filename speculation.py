@@ -0,0 +1,184 @@
+"""
+Speculative pre-transformation
+Transforms newly copied text in the background, so a hotkey press for the same
+text can paste the ready result instead of transforming it then
+"""
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Optional
+import psutil
+from config_manager import TransformSettings
+from result_cache import TransformResultCache
+
+# Larger clipboard contents are left for the hotkey to transform
+SPECULATION_MAX_SIZE = 512 * 1024
+# Seconds to trust a battery reading before asking psutil again
+BATTERY_CHECK_INTERVAL = 30.0
+
+def on_battery() -> bool:
+    """Whether the machine is running on battery power"""
+    try:
+        battery = psutil.sensors_battery()
+    except (AttributeError, NotImplementedError, OSError, RuntimeError):
+        return False
+    return battery is not None and not battery.power_plugged
+
+def _lower_thread_priority():
+    """Best effort: run the calling thread below the GUI and hook threads"""
+    try:
+        if sys.platform == 'win32':
+            import ctypes
+            kernel32 = ctypes.windll.kernel32
+            kernel32.SetThreadPriority(kernel32.GetCurrentThread(), -2)  # THREAD_PRIORITY_LOWEST
+        elif sys.platform.startswith('linux'):
+            # Linux threads have their own nice value
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 10)
+    except (AttributeError, OSError):
+        pass
+
+class SpeculativeTransformer:
+    """One-slot cache of the transformed clipboard, filled on a low-priority thread"""
+
+    def __init__(self, text_processor, read_clipboard: Callable[[], str], max_size: int = SPECULATION_MAX_SIZE):
+        self.text_processor = text_processor
+        self.read_clipboard = read_clipboard
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._cancel = threading.Event()
+        # The slot: key (content hash + flags), result, and whether the result is ready yet
+        self._key = None
+        self._result: Optional[str] = None
+        self._ready = threading.Event()
+        # Our own output shows up on the clipboard too; never speculate on it
+        self._output_key = None
+        # Neither on text the hook copied and is transforming itself
+        self._hook_copies = 0
+        self._taken_key = None
+        self._battery = (0.0, False)
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+        self.hits = 0
+        self.misses = 0
+
+    def start(self):
+        """Start the background thread"""
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name='uwu-speculation', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background thread and drop the slot"""
+        self._running = False
+        self._cancel.set()
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join(1)
+        with self._lock:
+            self._key = self._result = None
+
+    def notify(self):
+        """The clipboard changed (connect to QClipboard.dataChanged); returns immediately
+
+        A running speculation is left to finish: it is capped at max_size, and
+        the hook's own ctrl+c republishes the very text being speculated.
+        Changes made by a hook copy in flight are ignored.
+        """
+        if not self._hook_copies:
+            self._wakeup.set()
+
+    @contextmanager
+    def hook_copy(self):
+        """Around the hook's own ctrl+c, whose clipboard change must not start a speculation"""
+        with self._lock:
+            self._hook_copies += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._hook_copies -= 1
+
+    def _make_key(self, text: str, settings: Optional[TransformSettings] = None) -> tuple:
+        """Slot key: content hash plus the flags (by default the ones in use right now)"""
+        return TransformResultCache.make_key(text, (settings or self.text_processor.settings)[1:])
+
+    def _on_battery(self) -> bool:
+        """on_battery(), cached for BATTERY_CHECK_INTERVAL"""
+        checked, result = self._battery
+        now = time.monotonic()
+        if now - checked >= BATTERY_CHECK_INTERVAL:
+            result = on_battery()
+            self._battery = (now, result)
+        return result
+
+    def _run(self):
+        """Background thread: transform each new clipboard text"""
+        _lower_thread_priority()
+        while self._running:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            if not self._running:
+                break
+            if self._on_battery():
+                continue
+            try:
+                text = self.read_clipboard()
+            except Exception:
+                continue
+            if not text or len(text) > self.max_size or not text.strip():
+                continue
+
+            # One snapshot of the transform for both the slot key and the result
+            transform = self.text_processor.prepare_transform(self.text_processor.settings)
+            key = self._make_key(text, transform[0])
+            with self._lock:
+                if self._hook_copies or key in (self._key, self._output_key, self._taken_key):
+                    continue
+                self._key, self._result = key, None
+                ready = self._ready = threading.Event()
+
+            result = self.text_processor.process_text_cancellable(text, self._cancel, transform=transform)
+            with self._lock:
+                if self._key == key:
+                    if result is None:
+                        self._key = None  # Cancelled; leave the slot empty
+                    else:
+                        self._result = result
+                        self._output_key = self._make_key(result)
+            ready.set()
+
+    def note_output(self, text: str):
+        """Text we're about to put on the clipboard ourselves; don't speculate on it"""
+        key = self._make_key(text)
+        with self._lock:
+            self._output_key = key
+
+    def take(self, text: str, cancel: Optional[threading.Event] = None,
+             settings: Optional[TransformSettings] = None) -> Optional[str]:
+        """Result for text if it was (or is being) speculated with settings, else None
+
+        Waits for a speculation of the same text that is still running,
+        unless cancel is set meanwhile.
+        """
+        key = self._make_key(text, settings)
+        with self._lock:
+            if key != self._key:
+                # The caller transforms it now; a late clipboard notification shouldn't repeat that
+                self._taken_key = key
+                self.misses += 1
+                return None
+            ready = self._ready
+        while not ready.wait(0.05):
+            if cancel is not None and cancel.is_set():
+                return None
+        with self._lock:
+            if key != self._key or self._result is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return self._result
@@ -0,0 +1,55 @@
+"""
+Tests for clipboard snapshots: every format comes back byte for byte, in
+order, whether it was kept raw, compressed or spilled to disk
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import clipboard_snapshot
+from clipboard_snapshot import ClipboardSnapshot
+
+def payload(size: int) -> bytes:
+    """Incompressible bytes"""
+    return os.urandom(size)
+
+def test_formats_round_trip_in_order():
+    small = b"hello"
+    medium = payload(clipboard_snapshot.INLINE_LIMIT + 1)
+    large = payload(clipboard_snapshot.SPILL_THRESHOLD + 1)
+    snapshot = ClipboardSnapshot()
+    snapshot.add(13, small)
+    snapshot.add('image/png', medium)
+    snapshot.add(49161, large)
+    assert snapshot.formats == [13, 'image/png', 49161]
+    assert list(snapshot.items()) == [(13, small), ('image/png', medium), (49161, large)]
+    assert snapshot.size == len(small) + len(medium) + len(large)
+    assert snapshot.get('image/png') == medium
+    assert snapshot.get('missing') is None
+
+def test_large_payloads_stay_out_of_memory():
+    large = payload(clipboard_snapshot.SPILL_THRESHOLD + 1)
+    snapshot = ClipboardSnapshot()
+    snapshot.add('big', large)
+    assert snapshot.memory_bytes == 0
+    assert snapshot.get('big') == large
+
+def test_memory_cap_spills_the_rest():
+    snapshot = ClipboardSnapshot(max_memory=100)
+    snapshot.add('a', b"x" * 80)
+    snapshot.add('b', b"y" * 80)
+    assert snapshot.memory_bytes <= 100
+    assert snapshot.get('a') == b"x" * 80
+    assert snapshot.get('b') == b"y" * 80
+
+def test_release_drops_everything():
+    snapshot = ClipboardSnapshot()
+    snapshot.add('big', payload(clipboard_snapshot.SPILL_THRESHOLD + 1))
+    snapshot.release()
+    assert snapshot.released
+    assert snapshot.formats == []
+    assert list(snapshot.items()) == []
+    assert snapshot.memory_bytes == 0
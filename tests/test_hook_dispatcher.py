@@ -0,0 +1,96 @@
+"""
+Tests for the hook work dispatcher
+
+    python -m pytest tests
+"""
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hook_dispatcher import HookDispatcher
+
+@pytest.fixture
+def dispatcher():
+    dispatcher = HookDispatcher('test-dispatcher')
+    dispatcher.start()
+    yield dispatcher
+    dispatcher.stop()
+
+def wait_for(event: threading.Event, timeout: float = 2.0):
+    assert event.wait(timeout), "dispatcher didn't get to it"
+
+def test_jobs_run_in_order_on_one_thread(dispatcher):
+    ran, threads, done = [], set(), threading.Event()
+    for i in range(20):
+        def job(i=i):
+            ran.append(i)
+            threads.add(threading.current_thread().name)
+        dispatcher.submit(job)
+    dispatcher.submit(done.set)
+    wait_for(done)
+    assert ran == list(range(20))
+    assert threads == {'test-dispatcher'}
+
+def test_timers_fire_in_due_order(dispatcher):
+    fired, done = [], threading.Event()
+    dispatcher.schedule(0.06, done.set)
+    dispatcher.schedule(0.04, lambda: fired.append('late'))
+    dispatcher.schedule(0.02, lambda: fired.append('early'))
+    wait_for(done)
+    assert fired == ['early', 'late']
+    assert dispatcher.metrics()['timers_fired'] == 3
+
+def test_cancelled_timer_never_fires(dispatcher):
+    fired, done = [], threading.Event()
+    timer = dispatcher.schedule(0.02, lambda: fired.append('cancelled'))
+    assert dispatcher.cancel(timer)
+    dispatcher.schedule(0.05, done.set)
+    wait_for(done)
+    assert fired == []
+    assert not timer.pending
+    assert dispatcher.metrics()['timers_cancelled'] == 1
+
+def test_cancel_after_firing_reports_false(dispatcher):
+    done = threading.Event()
+    timer = dispatcher.schedule(0, done.set)
+    wait_for(done)
+    assert not dispatcher.cancel(timer)
+    assert not dispatcher.cancel(None)
+
+def test_timer_waits_for_the_running_job(dispatcher):
+    events, done = [], threading.Event()
+
+    def slow_job():
+        events.append('job start')
+        time.sleep(0.1)
+        events.append('job end')
+    dispatcher.submit(slow_job)
+    dispatcher.schedule(0.01, lambda: (events.append('timer'), done.set()))
+    wait_for(done)
+    assert events == ['job start', 'job end', 'timer']
+
+def test_failing_job_doesnt_stop_the_thread(dispatcher):
+    done = threading.Event()
+
+    def fail():
+        raise RuntimeError("boom")
+    dispatcher.submit(fail)
+    dispatcher.submit(done.set)
+    wait_for(done)
+
+def test_stop_drops_queued_work():
+    dispatcher = HookDispatcher()
+    assert not dispatcher.submit(lambda: None)  # Not started yet
+    dispatcher.start()
+    fired = []
+    dispatcher.schedule(10, lambda: fired.append('timer'))
+    dispatcher.stop()
+    assert dispatcher.metrics()['pending_timers'] == 0
+    assert dispatcher.metrics()['dispatcher_threads'] == 0
+    assert not dispatcher.submit(lambda: None)
+    assert fired == []
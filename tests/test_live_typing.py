@@ -0,0 +1,175 @@
+"""
+Tests for the live typing state machine
+Key events go straight to the transformer's hook callback, and an input
+backend that plays a text field applies the corrections it sends
+
+    python -m pytest tests
+"""
+import os
+import sys
+import threading
+from contextlib import contextmanager
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from input_backend import InputBackend
+from live_typing import MAX_WORD_LENGTH, LiveTypingTransformer
+from text_processor import SelectionUwuTextProcessor
+
+class TextFieldInput(InputBackend):
+    """A text field: real keys and synthetic ones both edit it, synthetic ones come back flagged as injected"""
+
+    name = 'text-field'
+    reports_injected = True
+    can_hold_input = True
+
+    def __init__(self):
+        super().__init__()
+        self.text = []
+        self.callback = None
+        self.held = []  # Events hold_input reports as held back
+
+    def hook_keys(self, callback):
+        self.callback = callback
+        return callback
+
+    def unhook_keys(self, handle):
+        self.callback = None
+
+    def press_and_release(self, keys: str):
+        assert keys == 'backspace'
+        self.text.pop()
+        self.callback('backspace', True, True)
+        self.callback('backspace', False, True)
+
+    def write(self, text: str):
+        for char in text:
+            self.text.append(char)
+            self.callback(char, True, True)
+            self.callback(char, False, True)
+
+    @contextmanager
+    def hold_input(self):
+        yield self.held
+
+    def key(self, name: str, char: str = ''):
+        """A real key press and release"""
+        if name == 'backspace':
+            self.text.pop()
+        else:
+            self.text.append(char)
+        self.callback(name, True, False)
+        self.callback(name, False, False)
+
+    def type(self, text: str):
+        for char in text:
+            self.key('space' if char == ' ' else char, char)
+
+    @property
+    def value(self) -> str:
+        return "".join(self.text)
+
+@pytest.fixture
+def field():
+    return TextFieldInput()
+
+@pytest.fixture
+def live(field):
+    processor = SelectionUwuTextProcessor()
+    live = LiveTypingTransformer(processor, field)
+    live.start()
+    yield live
+    live.stop()
+    processor.shutdown()
+
+def settle(live):
+    """Wait for every queued correction (the dispatcher runs jobs in order)"""
+    done = threading.Event()
+    live.dispatcher.submit(done.set)
+    assert done.wait(5), "correction didn't finish"
+
+def type_words(live, field, text: str):
+    """Type text, letting each word's correction land before the next key"""
+    for char in text:
+        field.type(char)
+        if char == ' ':
+            settle(live)
+
+def test_finished_words_are_corrected(live, field):
+    type_words(live, field, "hello world ")
+    assert field.value == "hewwo wowwd "
+    assert live.corrections == 2
+
+def test_unfinished_word_is_left_alone(live, field):
+    type_words(live, field, "hello worl")
+    assert field.value == "hewwo worl"
+
+def test_backspace_inside_the_word_keeps_tracking(live, field):
+    field.type("hellx")
+    field.key('backspace')
+    type_words(live, field, "o ")
+    assert field.value == "hewwo "
+
+def test_backspace_past_the_word_stops_tracking(live, field):
+    type_words(live, field, "ok ")
+    field.key('backspace')
+    type_words(live, field, "hello ")
+    assert field.value == "okhello "
+
+def test_cursor_keys_stop_tracking(live, field):
+    field.type("hello")
+    live._on_key('left', True)
+    type_words(live, field, " ")
+    assert field.value == "hello "
+    # The next word starts tracked again
+    type_words(live, field, "world ")
+    assert field.value == "hello wowwd "
+
+def test_shortcuts_stop_tracking(live, field):
+    field.type("hel")
+    live._on_key('left ctrl', True)
+    live._on_key('v', True)
+    live._on_key('left ctrl', False)
+    type_words(live, field, "lo ")
+    assert live.corrections == 0
+
+def test_overlong_words_are_left_as_typed(live, field):
+    word = "r" * (MAX_WORD_LENGTH + 1)
+    type_words(live, field, word + " ")
+    assert field.value == word + " "
+
+def test_keys_typed_during_a_correction_stop_tracking(live, field):
+    field.type("hello")
+    live._correcting = True
+    live._on_key('x', True)
+    live._correcting = False
+    type_words(live, field, " ")
+    assert live.corrections == 0
+
+def test_held_keys_stop_tracking_the_next_word(live, field):
+    field.held.append('held key')
+    type_words(live, field, "hello ")
+    assert field.value == "hewwo "
+    assert not live._tracked
+
+def test_injected_keys_are_ignored(live, field):
+    field.type("hel")
+    live._on_key('backspace', True, injected=True)
+    live._on_key('left', True, injected=True)
+    type_words(live, field, "lo ")
+    assert field.value == "hewwo "
+
+def test_enter_starts_over(live, field):
+    field.type("hello")
+    live._on_key('enter', True)
+    type_words(live, field, " ")
+    assert live.corrections == 0
+
+def test_refuses_backends_that_cant_flag_injected_keys():
+    processor = SelectionUwuTextProcessor()
+    live = LiveTypingTransformer(processor, InputBackend())
+    live.start()
+    assert not live.enabled
+    processor.shutdown()
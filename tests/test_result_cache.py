@@ -0,0 +1,64 @@
+"""
+Tests for the transform result cache
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from result_cache import TransformResultCache
+
+def key(text: str, flags=0) -> tuple:
+    return TransformResultCache.make_key(text, flags)
+
+def test_keys_depend_on_text_and_flags():
+    assert key("hello") == key("hello")
+    assert key("hello") != key("hellO")
+    assert key("hello", 1) != key("hello", 2)
+
+def test_get_returns_what_was_put():
+    cache = TransformResultCache()
+    assert cache.get(key("hello")) is None
+    cache.put(key("hello"), "hewwo")
+    assert cache.get(key("hello")) == "hewwo"
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 1
+
+def test_least_recently_used_evicted_first():
+    entry = sys.getsizeof("x" * 100)
+    cache = TransformResultCache(max_bytes=entry * 2, max_entry_fraction=1.0)
+    cache.put(key("a"), "a" * 100)
+    cache.put(key("b"), "b" * 100)
+    cache.get(key("a"))  # b is now the least recently used
+    cache.put(key("c"), "c" * 100)
+    assert cache.get(key("b")) is None
+    assert cache.get(key("a")) == "a" * 100
+    assert cache.get(key("c")) == "c" * 100
+    assert cache.stats()['evictions'] == 1
+    assert cache.current_bytes <= cache.max_bytes
+
+def test_replacing_an_entry_keeps_the_byte_count():
+    cache = TransformResultCache()
+    cache.put(key("a"), "short")
+    cache.put(key("a"), "a much longer result")
+    assert cache.current_bytes == sys.getsizeof("a much longer result")
+    assert cache.stats()['entries'] == 1
+
+def test_oversized_results_are_rejected():
+    cache = TransformResultCache(max_bytes=10000, max_entry_fraction=0.1)
+    cache.put(key("small"), "ok")
+    big = "x" * 2000
+    assert not cache.accepts(big)
+    cache.put(key("big"), big)
+    assert cache.get(key("big")) is None
+    assert cache.get(key("small")) == "ok"
+    assert cache.stats()['rejections'] == 1
+
+def test_clear_drops_everything():
+    cache = TransformResultCache()
+    cache.put(key("a"), "a")
+    cache.clear()
+    assert cache.get(key("a")) is None
+    assert cache.current_bytes == 0
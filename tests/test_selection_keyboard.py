@@ -0,0 +1,154 @@
+"""
+Behaviour tests for the selection hotkey
+Drives SelectionKeyboardHook against the in-memory clipboard backend, with
+an input backend that records keystrokes instead of sending them
+
+    python -m pytest tests
+"""
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from clipboard_backend import MemoryClipboardBackend
+from input_backend import InputBackend
+from selection_keyboard import MAX_PENDING_JOBS, UNDO_SELECT_LIMIT, SelectionKeyboardHook
+from text_processor import SelectionUwuTextProcessor
+
+USER_CLIPBOARD = "USER ORIGINAL CLIPBOARD"
+
+class RecordingInput(InputBackend):
+    """Keystrokes are recorded, never sent"""
+
+    name = 'recording'
+
+    def __init__(self):
+        super().__init__()
+        self.sent = []
+
+    def press_and_release(self, keys: str):
+        self.sent.append(keys)
+
+    def is_pressed(self, key: str) -> bool:
+        return False
+
+def wait_idle(hook, timeout: float = 5.0):
+    """Wait until every queued hotkey job has finished"""
+    deadline = time.monotonic() + timeout
+    while hook.metrics()['pending_jobs']:
+        assert time.monotonic() < deadline, "hotkey job didn't finish"
+        time.sleep(0.001)
+
+@pytest.fixture
+def backend():
+    backend = MemoryClipboardBackend(selection="hello world")
+    backend.copy(USER_CLIPBOARD)
+    return backend
+
+@pytest.fixture
+def hook(backend):
+    processor = SelectionUwuTextProcessor()
+    hook = SelectionKeyboardHook(processor, clipboard_backend=backend, clipboard_timeout=0.2,
+                                 input_backend=RecordingInput())
+    hook.dispatcher.start()
+    yield hook
+    hook.stop()
+    processor.shutdown()
+
+def press(hook):
+    hook.trigger()
+    wait_idle(hook)
+
+def test_paste_replaces_selection_and_keeps_restore_pending(hook, backend):
+    press(hook)
+    assert backend.pasted == ["hewwo wowwd"]
+    assert backend.text == "hewwo wowwd"
+    hook.stop()
+    assert backend.text == USER_CLIPBOARD
+
+def test_press_with_nothing_selected_restores_pending_clipboard(hook, backend):
+    press(hook)
+    # A double press: the follow-up finds nothing selected any more
+    backend.selection = ""
+    press(hook)
+    assert backend.pasted == ["hewwo wowwd"]
+    assert backend.text == USER_CLIPBOARD
+
+def test_failed_press_restores_pending_clipboard(hook, backend, monkeypatch):
+    press(hook)
+
+    def fail(*args):
+        raise RuntimeError("transform failed")
+    monkeypatch.setattr(hook, '_transform', fail)
+    press(hook)
+    assert backend.text == USER_CLIPBOARD
+
+def test_press_with_no_copy_leaves_clipboard_alone(hook, backend):
+    backend.copy_latency = 10.0  # The copy never lands
+    count = backend.change_count()
+    press(hook)
+    assert backend.pasted == []
+    assert backend.text == USER_CLIPBOARD
+    assert backend.change_count() == count
+
+def undo(hook):
+    hook.set_history_hotkeys('ctrl+alt+z', None)
+    hook._on_undo_hotkey()
+    wait_idle(hook)
+
+def test_undo_selects_pasted_text_back_and_pastes_original(hook, backend):
+    press(hook)
+    hook.input.sent.clear()
+    undo(hook)
+    assert hook.input.sent == ['shift+left'] * len("hewwo wowwd")
+    assert backend.pasted == ["hewwo wowwd", "hello world"]
+    assert len(hook.history) == 0
+
+@pytest.mark.parametrize('pasted, steps', [
+    ("( ͡U ω ͡U )", 9),
+    ("*˚*(ꈍ ω ꈍ).₊̣̇.", 13),
+    ("– ̗̀ (ᵕ꒳ᵕ) ̖́-", 10),
+    ("hi 👨‍👩‍👧 🇩🇪", 6),
+    ("line\r\nbreak", 10),
+], ids=['combining', 'stacked-combining', 'leading-combining', 'zwj-and-flag', 'crlf'])
+def test_undo_selects_back_one_step_per_grapheme(hook, backend, pasted, steps):
+    hook.history.add("original", pasted, None)
+    undo(hook)
+    assert hook.input.sent == ['shift+left'] * steps
+    assert backend.pasted == ["original"]
+
+# Conjoining Hangul jamo make one syllable the editor steps over at once
+@pytest.mark.parametrize('pasted', ["x" * (UNDO_SELECT_LIMIT + 1), "\u1100\u1161"], ids=['too-long', 'hangul-jamo'])
+def test_undo_falls_back_to_ctrl_z_without_pasting(hook, backend, pasted):
+    hook.history.add("original", pasted, None)
+    undo(hook)
+    assert hook.input.sent == ['ctrl+z']
+    assert backend.pasted == []
+    assert backend.text == USER_CLIPBOARD
+    assert len(hook.history) == 0
+
+def test_repeated_presses_coalesce_per_hotkey(hook):
+    release = threading.Event()
+    hook.dispatcher.submit(release.wait)  # Keep the dispatcher busy while the presses arrive
+    ran = []
+    for _ in range(5):
+        hook._queue(ran.append, 'ctrl+u')
+    hook._queue(ran.append, 'ctrl+alt+z')
+    assert hook.metrics()['pending_jobs'] == MAX_PENDING_JOBS + 1
+    assert hook.metrics()['presses_coalesced'] == 5 - MAX_PENDING_JOBS
+    release.set()
+    wait_idle(hook)
+    assert ran == ['ctrl+u'] * MAX_PENDING_JOBS + ['ctrl+alt+z']
+
+def test_press_cancels_running_transform_when_enabled(hook):
+    hook.cancel_on_press = True
+    hook._transforming = True
+    ran = []
+    hook._queue(ran.append, 'ctrl+u', cancels=True)
+    assert hook._cancel_event.is_set()
+    assert hook.metrics()['pending_jobs'] == 0
+    assert ran == []
@@ -0,0 +1,67 @@
+"""
+Tests for SelectionUwuTextProcessor
+Streamed and parallel runs must match a one-shot transform of the same text
+
+    python -m pytest tests
+"""
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import uwuify
+import text_processor
+from config_manager import TransformSettings
+from result_cache import TransformResultCache
+from text_processor import SelectionUwuTextProcessor
+from test_uwu_engine import ALL_FLAGS, ALPHABET, random_text
+
+# No spaces or newlines, so find_cut finds nothing
+NO_CUT_ALPHABET = "aeErRlLuUyw.?!,'-é日"
+
+def settings_for(flags: int, seed: int = 7) -> TransformSettings:
+    return TransformSettings(
+        smiley=bool(flags & uwuify.UwuifyFlag.SMILEY),
+        yu=bool(flags & uwuify.UwuifyFlag.YU),
+        stutter=bool(flags & uwuify.UwuifyFlag.STUTTER),
+        nouwu=bool(flags & uwuify.UwuifyFlag.NOUWU),
+        seeded=True,
+        seed=seed,
+    )
+
+@pytest.fixture
+def processor():
+    processor = SelectionUwuTextProcessor(result_cache=TransformResultCache(max_bytes=0))
+    yield processor
+    processor.shutdown()
+
+@pytest.mark.parametrize('flags', ALL_FLAGS)
+def test_chunked_matches_one_shot(processor, monkeypatch, flags):
+    # Small enough that runs without cut points get split inside words too
+    monkeypatch.setattr(text_processor, 'FALLBACK_CUT_SIZE', 32)
+    rng = random.Random(200 + flags)
+    transform = processor.prepare_transform(settings_for(flags))
+    for _ in range(100):
+        text = random_text(rng, rng.randrange(0, 400), rng.choice((ALPHABET, NO_CUT_ALPHABET)))
+        chunks, start = [], 0
+        while start < len(text):
+            size = rng.randrange(1, 50)
+            chunks.append(text[start:start + size])
+            start += size
+        expected = processor.process_text(text, transform)
+        assert "".join(processor.process_chunks(chunks, transform)) == expected, repr(text)
+
+@pytest.mark.parametrize('flags', (0, 5, 10, 15))
+def test_parallel_matches_one_shot(processor, monkeypatch, flags):
+    monkeypatch.setattr(text_processor, 'PARALLEL_PIECE_SIZE', 500)
+    processor.parallel_threshold = 2000
+    processor._pool_workers = 2
+    transform = processor.prepare_transform(settings_for(flags))
+    _, pipeline, seed = transform
+    text = random_text(random.Random(300 + flags), 20000)
+    assert processor.process_text(text, transform) == pipeline(text, seed=seed)
+    assert processor._pool is not None  # Really went through the pool
@@ -0,0 +1,53 @@
+"""
+Tests for the transformation history behind the undo and re-paste hotkeys
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import transform_history
+from transform_history import TransformHistory
+
+def test_last_and_pop_return_newest_first():
+    history = TransformHistory()
+    history.add("hello", "hewwo", 1)
+    history.add("world", "wowwd", 2)
+    assert history.last() == ("world", "wowwd", 2)
+    assert history.pop() == ("world", "wowwd", 2)
+    assert history.pop() == ("hello", "hewwo", 1)
+    assert history.pop() is None
+    assert history.last() is None
+    assert history.memory_bytes == 0
+
+def test_oldest_entries_evicted_by_count():
+    history = TransformHistory(max_entries=2)
+    for i in range(4):
+        history.add(f"text {i}", f"uwu {i}", None)
+    assert len(history) == 2
+    assert history.evictions == 2
+    assert history.pop().original == "text 3"
+    assert history.pop().original == "text 2"
+
+def test_oldest_entries_evicted_by_size():
+    history = TransformHistory(max_bytes=100)
+    history.add("a" * 30, "b" * 30, None)
+    history.add("c" * 30, "d" * 30, None)
+    assert len(history) == 1
+    assert history.last().original == "c" * 30
+    assert history.memory_bytes <= 100
+
+def test_entry_over_the_cap_is_refused():
+    history = TransformHistory(max_bytes=10)
+    assert not history.add("a" * 20, "b" * 20, None)
+    assert len(history) == 0
+
+def test_large_texts_round_trip_compressed():
+    original = "hello world, " * transform_history.COMPRESS_THRESHOLD
+    transformed = "hewwo wowwd 🦄 " * transform_history.COMPRESS_THRESHOLD
+    history = TransformHistory()
+    history.add(original, transformed, None)
+    assert history.memory_bytes < len(original)
+    assert history.last() == (original, transformed, None)
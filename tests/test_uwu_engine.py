@@ -0,0 +1,66 @@
+"""
+Equivalence tests for the compiled uwuify engine
+The compiled pipelines must match uwuify.uwu for every flag combination, and
+pieces cut at find_cut points must match the whole text
+
+    python -m pytest tests
+"""
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import uwuify
+from uwu_engine import compile_pipeline, count_words, find_cut
+
+ALL_FLAGS = range(16)
+# Heavy on the characters the rules look at: r/l, u, -er endings, sentence
+# ends, and runs of spaces and newlines
+ALPHABET = "aeeErrRllLuuUyw.?!,'-  \n\t" + "é日🦄"
+WORDS = ("lover", "rule", "under", "user", "flower", "letter", "u", "Uwu", "er", "hello", "really")
+
+def random_text(rng: random.Random, length: int, alphabet: str = ALPHABET) -> str:
+    """Random mix of whole words and loose characters"""
+    parts = []
+    while sum(map(len, parts)) < length:
+        if rng.random() < 0.3:
+            parts.append(rng.choice(WORDS))
+        else:
+            parts.append(rng.choice(alphabet))
+    return "".join(parts)
+
+@pytest.mark.parametrize('flags', ALL_FLAGS)
+def test_pipeline_matches_uwuify(flags):
+    rng = random.Random(flags)
+    pipeline = compile_pipeline(flags)
+    for case in range(300):
+        text = random_text(rng, rng.randrange(0, 120))
+        # Unseeded smileys come from the random module in the same order as uwuify's
+        random.seed(case)
+        expected = uwuify.uwu(text, flags=uwuify.UwuifyFlag(flags))
+        random.seed(case)
+        assert pipeline(text) == expected, repr(text)
+
+@pytest.mark.parametrize('flags', ALL_FLAGS)
+def test_find_cut_pieces_match_whole(flags):
+    rng = random.Random(100 + flags)
+    pipeline = compile_pipeline(flags)
+    for _ in range(200):
+        text = random_text(rng, rng.randrange(1, 200))
+        pieces, start = [], 0
+        while start < len(text):
+            cut = find_cut(text, rng.randrange(start, len(text) + 1), start)
+            end = cut if cut > start else len(text)
+            pieces.append((start, end))
+            start = end
+
+        output, words_before = [], 0
+        for start, end in pieces:
+            piece = text[start:end]
+            prev = text[start - 1] if start else ""
+            output.append(pipeline(piece, seed=3, prev=prev, last=end == len(text), words_before=words_before))
+            words_before = (words_before + count_words(piece)) % 4
+        assert "".join(output) == pipeline(text, seed=3), repr(text)
@@ -0,0 +1,259 @@
+"""
+Text processor for the UwUifier
+Transforms text with the configured uwuify flags, without any GUI or keyboard dependencies
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional, Iterable, Iterator, TextIO
+from config_manager import TransformSettings
+from result_cache import TransformResultCache
+from uwu_engine import (compile_pipeline, count_words, find_cut, find_fallback_cut, flags_from_options,
+                        split_boundaries, transform_piece, warm_worker)
+
+# Characters read per chunk when streaming a file through the processor
+STREAM_CHUNK_SIZE = 64 * 1024
+# Streamed text with no safe cut is split inside words past this size, when the flags allow it
+FALLBACK_CUT_SIZE = STREAM_CHUNK_SIZE
+# Selections at least this long are split across the process pool
+PARALLEL_THRESHOLD = 1024 * 1024
+PARALLEL_PIECE_SIZE = 256 * 1024
+# Cancellable transforms check for cancellation every this many characters
+CANCEL_CHECK_SIZE = 64 * 1024
+
+class SelectionUwuTextProcessor:
+    """Processes selected text through uwuifier"""
+    
+    def __init__(self, config_manager=None, result_cache: Optional[TransformResultCache] = None):
+        self.enabled = True
+        self.config_manager = config_manager
+        self.result_cache = result_cache if result_cache is not None else TransformResultCache()
+        self.parallel_threshold = PARALLEL_THRESHOLD
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_workers = max(1, (os.cpu_count() or 1) - 1)
+        self._pool_lock = threading.Lock()
+        # (settings snapshot, compiled pipeline, smiley seed or None), swapped as a single reference
+        self._transform = (TransformSettings(), compile_pipeline(0), None)
+        if self.config_manager:
+            self.config_manager.add_settings_listener(self.apply_settings)
+    
+    def apply_settings(self, settings: TransformSettings):
+        """Switch to a new settings snapshot (pushed by the config manager)"""
+        self._transform = self.prepare_transform(settings)
+    
+    @staticmethod
+    def prepare_transform(settings: TransformSettings) -> tuple:
+        """Compile settings into a (settings, pipeline, seed) transform
+        
+        The result can be passed as transform= to the process_* methods to
+        transform with other settings than the current ones.
+        """
+        flags = flags_from_options(settings.smiley, settings.yu, settings.stutter, settings.nouwu)
+        seed = settings.seed if settings.seeded else None
+        return (settings, compile_pipeline(flags), seed)
+    
+    @property
+    def settings(self) -> TransformSettings:
+        """The transform settings snapshot currently in use"""
+        return self._transform[0]
+        
+    def process_text(self, text: str, transform: Optional[tuple] = None) -> str:
+        """Process text through uwuifier with configured flags (or a prepared transform)"""
+        if not text.strip():
+            return text
+            
+        try:
+            # Single attribute read, safe against concurrent settings changes
+            settings, pipeline, seed = transform or self._transform
+            
+            if len(text) >= self.parallel_threshold and self._pool_workers > 1:
+                return self._process_parallel(text, pipeline, seed)
+            
+            key = self._cache_key(text, settings, pipeline, seed)
+            if key is None:
+                return pipeline(text, seed=seed)
+            
+            result = self.result_cache.get(key)
+            if result is None:
+                result = pipeline(text, seed=seed)
+                self.result_cache.put(key, result)
+            return result
+        except Exception:
+            return text
+    
+    def process_text_cancellable(self, text: str, cancel: threading.Event,
+                                 progress: Optional[Callable[[int, int], None]] = None,
+                                 transform: Optional[tuple] = None) -> Optional[str]:
+        """Like process_text, but gives up and returns None once cancel is set
+        
+        Long texts are transformed in pieces so cancellation is noticed
+        between pieces instead of only after the whole transform. progress,
+        if given, is called with (characters done, total) after each piece.
+        """
+        if len(text) < CANCEL_CHECK_SIZE or not text.strip():
+            return self.process_text(text, transform)
+        
+        try:
+            transform = transform or self._transform
+            settings, pipeline, seed = transform
+            
+            if len(text) >= self.parallel_threshold and self._pool_workers > 1:
+                return self._process_parallel(text, pipeline, seed, cancel, progress)
+            
+            key = self._cache_key(text, settings, pipeline, seed)
+            if key is not None:
+                result = self.result_cache.get(key)
+                if result is not None:
+                    return result
+            
+            pieces = []
+            chunks = (text[i:i + CANCEL_CHECK_SIZE] for i in range(0, len(text), CANCEL_CHECK_SIZE))
+            for piece in self.process_chunks(chunks, transform):
+                if cancel.is_set():
+                    return None
+                pieces.append(piece)
+                if progress:
+                    # Output pieces line up with input chunks closely enough for a progress bar
+                    progress(min(len(text), len(pieces) * CANCEL_CHECK_SIZE), len(text))
+            result = "".join(pieces)
+            
+            if key is not None:
+                self.result_cache.put(key, result)
+            return result
+        except Exception:
+            return text
+    
+    def _cache_key(self, text: str, settings: TransformSettings, pipeline, seed: Optional[int]):
+        """Result cache key, or None when the result shouldn't be cached"""
+        # Only reuse results when the output is deterministic
+        deterministic = pipeline.deterministic or seed is not None
+        if not deterministic or not self.result_cache.accepts(text):
+            return None
+        return self.result_cache.make_key(text, settings[1:])
+    
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """Start the process pool on first use and warm up every worker"""
+        with self._pool_lock:
+            if self._pool is None:
+                # Never fork: the app's hook, Qt and dispatcher threads may hold locks the child would inherit
+                self._pool = ProcessPoolExecutor(max_workers=self._pool_workers, initializer=warm_worker,
+                                                 mp_context=multiprocessing.get_context('spawn'))
+                # Submitting one no-op per worker spawns them all right away
+                for _ in range(self._pool_workers):
+                    self._pool.submit(warm_worker)
+            return self._pool
+    
+    def _process_parallel(self, text: str, pipeline, seed: Optional[int],
+                          cancel: Optional[threading.Event] = None,
+                          progress: Optional[Callable[[int, int], None]] = None) -> Optional[str]:
+        """Split a large text at sentence/paragraph ends and transform the pieces in the pool"""
+        try:
+            pool = self._get_pool()
+            piece_size = max(PARALLEL_PIECE_SIZE, len(text) // (self._pool_workers * 4) + 1)
+            cuts = split_boundaries(text, piece_size)
+            
+            futures = []
+            words_before = 0
+            for start, end in zip([0] + cuts, cuts + [len(text)]):
+                piece = text[start:end]
+                prev = text[start - 1] if start else ""
+                futures.append((end, pool.submit(transform_piece, int(pipeline.flags), piece, seed,
+                                                 prev, end == len(text), words_before)))
+                if pipeline.stutter:
+                    words_before = (words_before + count_words(piece)) % 4
+            
+            # Pieces are reassembled in their original order
+            results = []
+            for end, future in futures:
+                if cancel is not None and cancel.is_set():
+                    for _, pending in futures:
+                        pending.cancel()
+                    return None
+                results.append(future.result())
+                if progress:
+                    progress(end, len(text))
+            return "".join(results)
+        except Exception as e:
+            print(f"Parallel transform failed, falling back to serial: {e}")
+            return pipeline(text, seed=seed)
+    
+    def shutdown(self):
+        """Stop the process pool, if it was started"""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            try:
+                pool.shutdown(wait=False, cancel_futures=True)
+            except TypeError:  # Python < 3.9
+                pool.shutdown(wait=False)
+    
+    def process_chunks(self, chunks: Iterable[str], transform: Optional[tuple] = None) -> Iterator[str]:
+        """Transform an iterable of text chunks, yielding transformed pieces
+        
+        Chunks may split words anywhere: text is only cut at safe boundaries,
+        so the joined output matches process_text on the joined input while
+        memory stays bounded by the chunk size. Only stutter and smileys
+        need whole words; with them, a single word longer than a chunk is
+        buffered until it ends.
+        """
+        # Use one settings snapshot for the whole stream
+        settings, pipeline, seed = transform or self._transform
+        buffer = ""
+        # How much of the buffer is known to hold no cut (or fallback cut), so each chunk is searched once
+        scanned = fallback_scanned = 0
+        prev = ""
+        words_before = 0
+        seen_text = False
+        
+        for chunk in chunks:
+            if not chunk:
+                continue
+            buffer += chunk
+            
+            # Whitespace-only input is returned untouched, like process_text
+            if not seen_text:
+                if buffer.isspace():
+                    continue
+                seen_text = True
+            
+            cut = find_cut(buffer, start=scanned)
+            if cut <= 0:
+                # The last characters may still form a cut with the next chunk
+                scanned = max(0, len(buffer) - 1)
+                if not pipeline.word_context and len(buffer) >= FALLBACK_CUT_SIZE:
+                    cut = find_fallback_cut(buffer, start=fallback_scanned)
+                    fallback_scanned = max(0, len(buffer) - 2)
+            if cut <= 0:
+                continue
+            
+            piece = buffer[:cut]
+            buffer = buffer[cut:]
+            scanned = fallback_scanned = 0
+            yield pipeline(piece, seed=seed, prev=prev, last=False, words_before=words_before)
+            prev = piece[-1]
+            if pipeline.stutter:
+                words_before = (words_before + count_words(piece)) % 4
+        
+        if buffer:
+            if not seen_text:
+                yield buffer
+            else:
+                yield pipeline(buffer, seed=seed, prev=prev, last=True, words_before=words_before)
+    
+    def process_stream(self, source: TextIO, destination: TextIO, line_buffered: bool = False):
+        """Transform a text stream into another, flushing as output is produced
+        
+        With line_buffered the source is read line by line, so each line is
+        written as soon as it arrives (for use as a filter on live streams).
+        """
+        if line_buffered:
+            chunks = iter(source.readline, "")
+        else:
+            chunks = iter(lambda: source.read(STREAM_CHUNK_SIZE), "")
+        
+        for piece in self.process_chunks(chunks):
+            destination.write(piece)
+            if line_buffered:
+                destination.flush()
+        destination.flush()
@@ -0,0 +1,143 @@
+"""
+Per-application clipboard timing profiles
+Learns how long copies take in each foreground application and turns that
+into wait and retry timing for the next hotkey press. Pastes aren't learned:
+the only thing the hook can time there is its own clipboard write landing,
+which says nothing about the application.
+"""
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from typing import Dict, NamedTuple, Optional
+import psutil
+from clipboard_wait import DEFAULT_CLIPBOARD_TIMEOUT, INITIAL_POLL_INTERVAL, MAX_POLL_INTERVAL
+
+PROFILES_FILE = 'timing_profiles.json'
+DEFAULT_APP = 'default'
+# Rolling window of samples kept per application
+PROFILE_WINDOW = 20
+# Samples needed before a profile overrides the defaults
+MIN_SAMPLES = 3
+DEFAULT_COPY_ATTEMPTS = 3
+MIN_ATTEMPT_TIMEOUT = 0.05
+MAX_ATTEMPT_TIMEOUT = 2.0
+SAVE_INTERVAL = 5.0
+
+class ClipboardTiming(NamedTuple):
+    """Wait and retry timing for one hotkey press"""
+    initial_interval: float = INITIAL_POLL_INTERVAL  # First poll delay
+    attempt_timeout: float = DEFAULT_CLIPBOARD_TIMEOUT / DEFAULT_COPY_ATTEMPTS  # Wait per ctrl+c
+    attempts: int = DEFAULT_COPY_ATTEMPTS
+    paste_timeout: float = DEFAULT_CLIPBOARD_TIMEOUT  # Wait for our own clipboard write to read back
+
+def foreground_app() -> str:
+    """Process name of the foreground window's application, or DEFAULT_APP"""
+    try:
+        pid = _foreground_pid()
+        if pid:
+            return psutil.Process(pid).name().lower()
+    except (psutil.Error, OSError, ValueError):
+        pass
+    return DEFAULT_APP
+
+def _foreground_pid() -> Optional[int]:
+    """PID owning the foreground window (Windows only, None elsewhere)"""
+    if sys.platform != 'win32':
+        return None
+    import ctypes
+    from ctypes import wintypes
+    user32 = ctypes.windll.user32
+    hwnd = user32.GetForegroundWindow()
+    if not hwnd:
+        return None
+    pid = wintypes.DWORD()
+    user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+    return pid.value or None
+
+class AppProfile:
+    """Rolling copy measurements for one application"""
+
+    def __init__(self, data: Optional[dict] = None):
+        data = data or {}
+        self.copy = deque(data.get('copy', []), maxlen=PROFILE_WINDOW)  # Seconds from ctrl+c to new text
+        self.retries = deque(data.get('retries', []), maxlen=PROFILE_WINDOW)  # Extra ctrl+c presses needed
+        self.failures = int(data.get('failures', 0))  # Recent copies that never arrived
+
+    def to_dict(self) -> dict:
+        return {'copy': list(self.copy), 'retries': list(self.retries), 'failures': self.failures}
+
+    def timing(self, clipboard_timeout: float) -> ClipboardTiming:
+        """Timing derived from the recorded samples"""
+        default = ClipboardTiming(attempt_timeout=clipboard_timeout / DEFAULT_COPY_ATTEMPTS,
+                                  paste_timeout=clipboard_timeout)
+        if len(self.copy) < MIN_SAMPLES:
+            return default
+
+        copy = sorted(self.copy)
+        median = copy[len(copy) // 2]
+        slowest = copy[-1]
+        # Fast apps get polled right away, slow ones aren't polled needlessly
+        initial_interval = min(max(median / 4, 0.001), MAX_POLL_INTERVAL)
+        # Leave headroom over the slowest recent copy, so slow apps stop timing out into retries
+        attempt_timeout = min(max(slowest * 1.5 + 0.02, MIN_ATTEMPT_TIMEOUT), MAX_ATTEMPT_TIMEOUT)
+        # Only keep extra ctrl+c presses for apps that have actually needed them
+        attempts = DEFAULT_COPY_ATTEMPTS if any(self.retries) or self.failures else 2
+        return ClipboardTiming(initial_interval, attempt_timeout, attempts, default.paste_timeout)
+
+class TimingProfiles:
+    """Persisted per-application profiles, stored next to config.json"""
+
+    def __init__(self, directory: Optional[str] = None):
+        self.path = os.path.join(directory or os.path.dirname(__file__), PROFILES_FILE)
+        self._lock = threading.Lock()
+        self._last_save = 0.0
+        self._dirty = False
+        self.profiles: Dict[str, AppProfile] = self._load()
+
+    def _load(self) -> Dict[str, AppProfile]:
+        """Load saved profiles, starting fresh if the file is missing or broken"""
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            return {app: AppProfile(entry) for app, entry in data.items() if isinstance(entry, dict)}
+        except (json.JSONDecodeError, IOError, TypeError, ValueError):
+            return {}
+
+    def save(self):
+        """Write the profiles to disk"""
+        with self._lock:
+            data = {app: profile.to_dict() for app, profile in self.profiles.items()}
+            self._dirty = False
+            self._last_save = time.monotonic()
+        try:
+            with open(self.path, 'w') as f:
+                json.dump(data, f, indent=2)
+        except IOError:
+            pass  # Fail silently
+
+    def timing_for(self, app: str, clipboard_timeout: float = DEFAULT_CLIPBOARD_TIMEOUT) -> ClipboardTiming:
+        """Timing to use for the next hotkey press in app"""
+        with self._lock:
+            profile = self.profiles.get(app)
+            return profile.timing(clipboard_timeout) if profile else AppProfile().timing(clipboard_timeout)
+
+    def record_copy(self, app: str, seconds: Optional[float], retries: int):
+        """Record a copy; seconds is None when no text ever arrived"""
+        with self._lock:
+            profile = self.profiles.setdefault(app, AppProfile())
+            if seconds is None:
+                profile.failures = min(profile.failures + 1, PROFILE_WINDOW)
+            else:
+                profile.copy.append(round(seconds, 4))
+                profile.retries.append(retries)
+                profile.failures = max(profile.failures - 1, 0)
+            self._dirty = True
+        self._save_soon()
+
+    def _save_soon(self):
+        """Save at most every SAVE_INTERVAL seconds so hotkey presses stay cheap"""
+        if self._dirty and time.monotonic() - self._last_save >= SAVE_INTERVAL:
+            self.save()
@@ -0,0 +1,92 @@
+"""
+Transformation history
+Bounded ring buffer of (original, transformed, flags) entries behind the undo
+and re-paste hotkeys, with large entries compressed and a total memory cap
+"""
+import threading
+import zlib
+from collections import deque
+from typing import Hashable, NamedTuple, Optional
+
+HISTORY_MAX_ENTRIES = 20
+HISTORY_MAX_BYTES = 8 * 1024 * 1024
+# Texts longer than this many characters are kept zlib-compressed
+COMPRESS_THRESHOLD = 16 * 1024
+
+class HistoryEntry(NamedTuple):
+    """One transform, with both texts expanded"""
+    original: str
+    transformed: str
+    flags: Hashable
+
+class _StoredText:
+    """A text kept as-is or compressed, with its memory cost"""
+    __slots__ = ('data', 'compressed', 'size')
+
+    def __init__(self, text: str):
+        if len(text) > COMPRESS_THRESHOLD:
+            self.data = zlib.compress(text.encode('utf-8', 'surrogatepass'), 1)
+            self.compressed = True
+            self.size = len(self.data)
+        else:
+            self.data = text
+            self.compressed = False
+            # Rough in-memory size; exactness doesn't matter for the cap
+            self.size = len(text) * (1 if text.isascii() else 4)
+
+    def text(self) -> str:
+        if self.compressed:
+            return zlib.decompress(self.data).decode('utf-8', 'surrogatepass')
+        return self.data
+
+class TransformHistory:
+    """Most recent transforms, evicted oldest first by count and total size"""
+
+    def __init__(self, max_entries: int = HISTORY_MAX_ENTRIES, max_bytes: int = HISTORY_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = deque()
+        self._lock = threading.Lock()
+        self.memory_bytes = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, original: str, transformed: str, flags: Hashable) -> bool:
+        """Record a transform; returns False if it alone exceeds the memory cap"""
+        stored = (_StoredText(original), _StoredText(transformed), flags)
+        size = stored[0].size + stored[1].size
+        if size > self.max_bytes:
+            return False
+        with self._lock:
+            self._entries.append((stored, size))
+            self.memory_bytes += size
+            while len(self._entries) > self.max_entries or self.memory_bytes > self.max_bytes:
+                _, evicted_size = self._entries.popleft()
+                self.memory_bytes -= evicted_size
+                self.evictions += 1
+        return True
+
+    def last(self) -> Optional[HistoryEntry]:
+        """The newest entry, or None"""
+        with self._lock:
+            if not self._entries:
+                return None
+            stored, _ = self._entries[-1]
+        return HistoryEntry(stored[0].text(), stored[1].text(), stored[2])
+
+    def pop(self) -> Optional[HistoryEntry]:
+        """Remove and return the newest entry, or None"""
+        with self._lock:
+            if not self._entries:
+                return None
+            stored, size = self._entries.pop()
+            self.memory_bytes -= size
+        return HistoryEntry(stored[0].text(), stored[1].text(), stored[2])
+
+    def clear(self):
+        """Forget every entry"""
+        with self._lock:
+            self._entries.clear()
+            self.memory_bytes = 0
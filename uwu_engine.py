@@ -0,0 +1,231 @@
+"""
+Compiled uwuify engine
+Precompiles one transformation pipeline per flag combination so the hot path
+only runs C-level regex substitutions and literal replacements
+"""
+import random
+import re
+import zlib
+from functools import lru_cache
+from typing import List, Optional
+
+import uwuify
+from uwuify.core import SMILEYS
+
+# Same rules as uwuify.core, rewritten so that every stage is a single
+# C-level pass over the whole string instead of a Python loop over words
+UWU_REPLACEMENTS = (("r", "w"), ("l", "w"), ("R", "W"), ("L", "W"))
+# YU turns every u/U into yu/yU except the first character of a
+# space-separated word, which is restored afterwards
+YU_REPLACEMENTS = (("u", "yu"), (" yu", " u"), ("U", "yU"), (" yU", " U"))
+
+# YU also grows runs of spaces because empty words are re-joined as " ":
+# every space followed by another space doubles, plus one at each end
+YU_SPACE_PAIR = re.compile(r" (?= )")
+# Equivalent to uwuify's (\b\w{2,})er\b once YU has run
+ER_SUFFIX = re.compile(r"[eE](?<=\w\w[eE])[rR]\b")
+# Stutter every 4th whitespace-separated word, one match per group of 4
+STUTTER_GROUP = re.compile(r"(\S)(\S*(?:\s+\S+){0,3}\s*)")
+# Leading words to skip when a piece doesn't start on a stutter word
+STUTTER_SKIP = {skip: re.compile(r"(?:\s*\S+){%d}\s*" % skip) for skip in (1, 2, 3)}
+# Smileys go after space-separated words ending in . ? or !
+SMILEY_PUNCT = re.compile(r"[.?!](?= |\Z)")
+
+
+def _seeded_smiley(match, seed: int) -> str:
+    """Pick a smiley from a stable hash of the word it decorates"""
+    text = match.string
+    end = match.end()
+    # Hash only the last whitespace-separated token so the choice never
+    # depends on text outside the word (chunked and parallel runs agree)
+    word = text[text.rfind(" ", 0, end) + 1:end].split()[-1]
+    index = zlib.crc32(word.encode('utf-8', 'surrogatepass'), seed & 0xFFFFFFFF) % len(SMILEYS)
+    return match.group() + " " + SMILEYS[index]
+
+
+def _replace_all(text: str, replacements) -> str:
+    """Apply a sequence of literal str.replace calls"""
+    for old, new in replacements:
+        text = text.replace(old, new)
+    return text
+
+
+class UwuPipeline:
+    """Precompiled transformation for one uwuify flag combination"""
+
+    def __init__(self, flags: uwuify.UwuifyFlag):
+        self.flags = uwuify.UwuifyFlag(flags)
+        self.yu = bool(self.flags & uwuify.UwuifyFlag.YU)
+        self.uwu = not self.flags & uwuify.UwuifyFlag.NOUWU
+        self.stutter = bool(self.flags & uwuify.UwuifyFlag.STUTTER)
+        self.smiley = bool(self.flags & uwuify.UwuifyFlag.SMILEY)
+        # Only smileys are random, everything else always gives the same output
+        # (a seeded call is deterministic regardless)
+        self.deterministic = not self.smiley
+        # Stutter counts words and smileys look at whole words; without them
+        # text can also be split inside a word (see find_fallback_cut)
+        self.word_context = self.stutter or self.smiley
+
+    def __call__(self, text: str, rng=random, seed: Optional[int] = None,
+                 prev: str = "", last: bool = True, words_before: int = 0) -> str:
+        """Transform text, producing the same output as uwuify.uwu
+        
+        With a seed, smileys are chosen from a hash of the word they follow
+        instead of rng, so the same text always gives the same output.
+        
+        prev, last and words_before describe where text sits inside a larger
+        input that was split with find_cut: the character just before it
+        ("" at the start), whether it is the final piece, and how many words
+        came before it. Transforming the pieces and joining them gives the
+        same result as transforming the whole input at once.
+        """
+        if not text:
+            return text
+
+        if self.yu:
+            # A u that starts a space-separated word keeps its first letter
+            starts_with_u = text[0] in "uU" and prev in ("", " ")
+            text = _replace_all(text, YU_REPLACEMENTS)
+            if starts_with_u:
+                text = text[1:]
+            if " " in text:
+                text = YU_SPACE_PAIR.sub("  ", text)
+                if text[0] == " " and not prev:
+                    text = " " + text
+                if text[-1] == " " and last:
+                    text += " "
+
+        if self.uwu:
+            text = _replace_all(ER_SUFFIX.sub("a", text), UWU_REPLACEMENTS)
+
+        if self.stutter:
+            skip = -words_before % 4
+            if not skip:
+                text = STUTTER_GROUP.sub(r"\1-\1\2", text)
+            else:
+                match = STUTTER_SKIP[skip].match(text)
+                if match and match.end() < len(text):
+                    text = text[:match.end()] + STUTTER_GROUP.sub(r"\1-\1\2", text[match.end():])
+
+        if self.smiley:
+            if seed is not None:
+                text = SMILEY_PUNCT.sub(lambda m: _seeded_smiley(m, seed), text)
+            else:
+                choice = rng.choice
+                text = SMILEY_PUNCT.sub(lambda m: m.group() + " " + choice(SMILEYS), text)
+
+        return text
+
+
+def find_cut(text: str, end: Optional[int] = None, start: int = 0) -> int:
+    """Find the last position in (start, end] where text can be split so the
+    pieces transform independently, or 0 if there is none
+    
+    Cuts go right after a newline, or after a single space that is followed
+    by a non-space character, so no word or run of spaces is ever split.
+    """
+    if end is None:
+        end = len(text)
+    cut = text.rfind("\n", start, end) + 1
+
+    pos = end
+    while True:
+        pos = text.rfind(" ", max(start, cut), pos)
+        if pos < 0:
+            return cut
+        after = pos + 1
+        if after < len(text) and text[after] != " " and (pos == 0 or text[pos - 1] != " "):
+            return after
+
+
+def find_fallback_cut(text: str, end: Optional[int] = None, start: int = 0) -> int:
+    """Find the last position in (start, end] where a run without find_cut
+    cuts can still be split for a pipeline without word_context, or 0
+    
+    The two characters on either side of the cut must not be spaces or an
+    e/E, so YU's word starts and the -er suffix rule see the same
+    neighbourhood in each piece as in the whole text.
+    """
+    if end is None:
+        end = len(text)
+    pos = min(end, len(text) - 2)
+    while pos > start and pos >= 2:
+        window = text[pos - 2:pos + 2]
+        unsafe = max(window.rfind(" "), window.rfind("e"), window.rfind("E"))
+        if unsafe < 0:
+            return pos
+        # Next candidate whose window ends before the unsafe character
+        pos -= 4 - unsafe
+    return 0
+
+
+def _find_boundary(text: str, start: int, end: int) -> int:
+    """Last paragraph or sentence end in [start, end] that is a safe cut, or 0"""
+    paragraph = text.rfind("\n\n", start, end)
+    if paragraph >= 0:
+        return paragraph + 2
+
+    best = 0
+    for ending in (". ", "? ", "! "):
+        pos = text.rfind(ending, start, end)
+        after = pos + 2
+        if pos >= 0 and after < len(text) and text[after] != " ":
+            best = max(best, after)
+    return best
+
+
+def split_boundaries(text: str, target_size: int) -> List[int]:
+    """Cut positions splitting text into pieces of roughly target_size,
+    preferring paragraph and sentence ends over plain word boundaries"""
+    cuts = []
+    start = 0
+    while len(text) - start > target_size:
+        end = start + target_size
+        cut = _find_boundary(text, start + target_size // 2, end)
+        if cut <= start:
+            cut = find_cut(text, end, start)
+        while cut <= start and end < len(text):
+            # No boundary yet (e.g. one huge word), look further ahead
+            end = min(len(text), end + target_size)
+            cut = find_cut(text, end, start)
+        if cut <= start or cut >= len(text):
+            break
+        cuts.append(cut)
+        start = cut
+    return cuts
+
+
+def count_words(text: str) -> int:
+    """Number of whitespace-separated words, as counted by the stutter rule"""
+    return len(text.split())
+
+
+@lru_cache(maxsize=None)
+def compile_pipeline(flags: int) -> UwuPipeline:
+    """Get the cached pipeline for a flag combination (only 16 exist)"""
+    return UwuPipeline(uwuify.UwuifyFlag(flags))
+
+
+def flags_from_options(smiley=False, yu=False, stutter=False, nouwu=False) -> uwuify.UwuifyFlag:
+    """Build uwuify flags from the four config options"""
+    flags = uwuify.UwuifyFlag.NONE
+    if smiley:
+        flags |= uwuify.UwuifyFlag.SMILEY
+    if yu:
+        flags |= uwuify.UwuifyFlag.YU
+    if stutter:
+        flags |= uwuify.UwuifyFlag.STUTTER
+    if nouwu:
+        flags |= uwuify.UwuifyFlag.NOUWU
+    return flags
+
+
+def warm_worker():
+    """Process pool initializer: compile every pipeline up front"""
+    for flags in range(16):
+        compile_pipeline(flags)
+
+
+def transform_piece(flags: int, text: str, seed: Optional[int], prev: str, last: bool, words_before: int) -> str:
+    """Transform one piece of a split input (runs in pool workers)"""
+    return compile_pipeline(flags)(text, seed=seed, prev=prev, last=last, words_before=words_before)
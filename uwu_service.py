@@ -0,0 +1,249 @@
+"""
+Local uwuification service
+asyncio server on a Unix domain socket (or localhost TCP) that shares the app's
+text processor, plus a small blocking client
+
+Framing: every request and response is a 4-byte big-endian length followed by
+that many bytes of UTF-8 text. Connections stay open for any number of
+requests, and requests may be pipelined; responses come back in order.
+"""
+import asyncio
+import concurrent.futures
+import os
+import socket
+import struct
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Optional, Set, Tuple, Union
+
+HEADER = struct.Struct('>I')
+MAX_FRAME_SIZE = 64 * 1024 * 1024
+# Pipelined requests in flight per connection; past this the service stops
+# reading from the client until responses have been written
+MAX_PIPELINED = 64
+# Unix sockets where available, localhost TCP otherwise (Windows)
+if hasattr(socket, 'AF_UNIX'):
+    DEFAULT_ADDRESS = os.path.join(tempfile.gettempdir(), 'uwuifier.sock')
+else:
+    DEFAULT_ADDRESS = '127.0.0.1:47820'
+
+def parse_address(address: str) -> Union[str, Tuple[str, int]]:
+    """'host:port' becomes a TCP address, anything else is a socket path"""
+    host, sep, port = address.rpartition(':')
+    if sep and port.isdigit() and os.sep not in host:
+        return (host or '127.0.0.1', int(port))
+    return address
+
+class UwuService:
+    """asyncio server that runs requests through a SelectionUwuTextProcessor"""
+
+    def __init__(self, text_processor, address: str = DEFAULT_ADDRESS, workers: int = 4):
+        self.text_processor = text_processor
+        self.address = parse_address(address)
+        # Transforms run here so neither the event loop nor the Qt loop ever block
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='uwu-service')
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.server = None
+        self.thread: Optional[threading.Thread] = None
+        self.requests = 0
+        self._clients: Set[asyncio.Task] = set()
+
+    async def _start_server(self):
+        """Bind the listening socket"""
+        if isinstance(self.address, tuple):
+            host, port = self.address
+            self.server = await asyncio.start_server(self._handle_client, host, port)
+        else:
+            if os.path.exists(self.address):
+                os.remove(self.address)  # Stale socket from a previous run
+            self.server = await asyncio.start_unix_server(self._handle_client, self.address)
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Read pipelined requests and write the responses back in order"""
+        loop = asyncio.get_running_loop()
+        handler = asyncio.current_task()
+        self._clients.add(handler)
+        responses: asyncio.Queue = asyncio.Queue(maxsize=MAX_PIPELINED)
+
+        async def write_responses():
+            while True:
+                future = await responses.get()
+                if future is None:
+                    break
+                data = (await future).encode('utf-8', 'surrogatepass')
+                writer.write(HEADER.pack(len(data)) + data)
+                await writer.drain()
+
+        def on_sender_done(task: asyncio.Task):
+            # A failed write leaves the reader blocked on a full queue; stop it too
+            if not task.cancelled() and task.exception() is not None:
+                print(f"uwu service client error: {task.exception()}")
+                handler.cancel()
+
+        sender = loop.create_task(write_responses())
+        sender.add_done_callback(on_sender_done)
+        try:
+            while True:
+                try:
+                    header = await reader.readexactly(HEADER.size)
+                except asyncio.IncompleteReadError:
+                    break  # Client closed the connection
+                (length,) = HEADER.unpack(header)
+                if length > MAX_FRAME_SIZE:
+                    print(f"⚠️ uwu service: dropping client sending a {length} byte frame")
+                    break
+                text = (await reader.readexactly(length)).decode('utf-8', 'surrogatepass')
+                self.requests += 1
+                await responses.put(loop.run_in_executor(self.executor, self.text_processor.process_text, text))
+            await responses.put(None)
+            await sender
+        except (ConnectionError, asyncio.IncompleteReadError, UnicodeDecodeError) as e:
+            print(f"uwu service client error: {e}")
+            sender.cancel()
+        except asyncio.CancelledError:
+            # Service shutting down, or the writer failed
+            sender.cancel()
+        finally:
+            self._clients.discard(handler)
+            writer.close()
+
+    def serve_forever(self):
+        """Run the service on the current thread (headless daemon)"""
+        asyncio.run(self._serve())
+
+    async def _serve(self):
+        """Bind and serve until cancelled"""
+        self.loop = asyncio.get_running_loop()
+        await self._start_server()
+        print(f"🦄 uwu service listening on {self.address}")
+        try:
+            await self.server.serve_forever()
+        except asyncio.CancelledError:
+            pass
+        finally:
+            await self._shutdown()
+
+    async def _shutdown(self):
+        """Stop listening, then cancel the open connections"""
+        if self.server:
+            self.server.close()
+        clients = list(self._clients)
+        for task in clients:
+            task.cancel()
+        await asyncio.gather(*clients, return_exceptions=True)
+        if self.server:
+            # Since Python 3.12 this also waits for open connections, hence after cancelling them
+            await self.server.wait_closed()
+
+    def start(self):
+        """Run the service on a background thread (inside the desktop app)"""
+        if self.thread and self.thread.is_alive():
+            return
+        started = threading.Event()
+
+        def run():
+            self.loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self.loop)
+            try:
+                self.loop.run_until_complete(self._start_server())
+                print(f"🦄 uwu service listening on {self.address}")
+            except OSError as e:
+                print(f"Failed to start uwu service: {e}")
+                started.set()
+                return
+            started.set()
+            self.loop.run_forever()
+
+            # Cancel connections that were still open when the loop stopped
+            tasks = asyncio.all_tasks(self.loop)
+            for task in tasks:
+                task.cancel()
+            self.loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            self.loop.close()
+
+        self.thread = threading.Thread(target=run, name='uwu-service', daemon=True)
+        self.thread.start()
+        started.wait(5)
+
+    def stop(self):
+        """Stop accepting requests and shut the background loop down"""
+        loop = self.loop
+        if loop is not None and loop.is_running():
+            try:
+                asyncio.run_coroutine_threadsafe(self._shutdown(), loop).result(2)
+            except concurrent.futures.TimeoutError:
+                print("uwu service: connections didn't close in time")
+            except RuntimeError:
+                pass  # Loop already closed
+            try:
+                loop.call_soon_threadsafe(loop.stop)
+            except RuntimeError:
+                pass
+        if self.thread:
+            self.thread.join(2)
+        self.executor.shutdown(wait=False)
+        if isinstance(self.address, str):
+            try:
+                os.remove(self.address)
+            except OSError:
+                pass
+
+class UwuClient:
+    """Blocking client for UwuService, one persistent connection"""
+
+    def __init__(self, address: str = DEFAULT_ADDRESS, timeout: Optional[float] = 30.0):
+        target = parse_address(address)
+        if isinstance(target, tuple):
+            self.sock = socket.create_connection(target, timeout=timeout)
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        else:
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.settimeout(timeout)
+            self.sock.connect(target)
+        self._file = self.sock.makefile('rb')
+
+    def _send(self, text: str):
+        """Write one request frame"""
+        data = text.encode('utf-8', 'surrogatepass')
+        self.sock.sendall(HEADER.pack(len(data)) + data)
+
+    def _receive(self) -> str:
+        """Read one response frame"""
+        header = self._file.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise ConnectionError("uwu service closed the connection")
+        (length,) = HEADER.unpack(header)
+        data = self._file.read(length)
+        if len(data) < length:
+            raise ConnectionError("uwu service closed the connection")
+        return data.decode('utf-8', 'surrogatepass')
+
+    def uwuify(self, text: str) -> str:
+        """Transform one text"""
+        self._send(text)
+        return self._receive()
+
+    def uwuify_many(self, texts: Iterable[str], window: int = 64) -> List[str]:
+        """Transform many texts, keeping up to window requests in flight"""
+        results = []
+        in_flight = 0
+        for text in texts:
+            self._send(text)
+            in_flight += 1
+            if in_flight >= window:
+                results.append(self._receive())
+                in_flight -= 1
+        results.extend(self._receive() for _ in range(in_flight))
+        return results
+
+    def close(self):
+        """Close the connection"""
+        self._file.close()
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,115 @@
+"""
+Headless command line UwUifier
+Runs the text processor on arguments, files or stdin without Qt, keyboard hooks or audio
+
+    python -m uwuifier "some text"
+    some_command | python -m uwuifier --stutter
+    python -m uwuifier --file input.txt --output output.txt
+    python -m uwuifier --bulk exports/ uwuified/ --include "*.txt"
+    python -m uwuifier --serve
+"""
+import argparse
+import sys
+from bulk_transform import BulkTransformer, format_stats
+from config_manager import ConfigManager, TransformSettings
+from text_processor import SelectionUwuTextProcessor
+from uwu_service import DEFAULT_ADDRESS, UwuService
+
+FLAG_OPTIONS = ('smiley', 'yu', 'stutter', 'nouwu', 'seeded')
+
+def build_parser() -> argparse.ArgumentParser:
+    """Command line options"""
+    parser = argparse.ArgumentParser(
+        prog='uwuifier',
+        description="uwuify text without the GUI. Flags default to the values in config.json.")
+    parser.add_argument('text', nargs='*', help="text to uwuify (reads stdin when omitted)")
+    parser.add_argument('-f', '--file', help="read input from this file instead of stdin")
+    parser.add_argument('-o', '--output', help="write output to this file instead of stdout")
+    parser.add_argument('--stdin', action='store_true', help="read stdin line by line (the default without text or --file)")
+    parser.add_argument('--bulk', nargs=2, metavar=('SOURCE_DIR', 'OUTPUT_DIR'),
+                        help="uwuify every file under SOURCE_DIR into OUTPUT_DIR, skipping unchanged files")
+    parser.add_argument('--include', action='append', metavar='PATTERN',
+                        help="file name pattern for --bulk, may be repeated (default: all files)")
+    parser.add_argument('-j', '--jobs', type=int, help="worker processes for --bulk (default: CPU count - 1)")
+    parser.add_argument('--serve', nargs='?', const=DEFAULT_ADDRESS, metavar='ADDRESS',
+                        help=f"run the uwu service on a socket path or host:port (default: {DEFAULT_ADDRESS})")
+    parser.add_argument('--encoding', default='utf-8', help="encoding for --file, --output and --bulk (default: utf-8)")
+    parser.add_argument('--no-config', action='store_true', help="ignore config.json and start from all flags off")
+    parser.add_argument('--seed', type=int, help="seed for deterministic smileys (implies --seeded)")
+
+    for name in FLAG_OPTIONS:
+        parser.add_argument(f'--{name}', dest=name, action='store_const', const=True, default=None,
+                            help=f"enable {name}")
+        parser.add_argument(f'--no-{name}', dest=name, action='store_const', const=False,
+                            help=f"disable {name}")
+    return parser
+
+def build_processor(args) -> SelectionUwuTextProcessor:
+    """Create a processor with config.json flags overridden by the command line"""
+    settings = TransformSettings() if args.no_config else ConfigManager().transform_settings
+
+    overrides = {name: getattr(args, name) for name in FLAG_OPTIONS if getattr(args, name) is not None}
+    if args.seed is not None:
+        overrides['seed'] = args.seed
+        overrides.setdefault('seeded', True)
+
+    processor = SelectionUwuTextProcessor()
+    processor.apply_settings(settings._replace(**overrides))
+    return processor
+
+def main(argv=None) -> int:
+    """Command line entry point"""
+    args = build_parser().parse_args(argv)
+    processor = build_processor(args)
+
+    # Never die on smileys the console code page can't show
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(errors='replace')
+
+    if args.serve:
+        service = UwuService(processor, args.serve)
+        try:
+            service.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        except OSError as e:
+            print(f"uwuifier: {e}", file=sys.stderr)
+            return 1
+        finally:
+            processor.shutdown()
+        return 0
+
+    if args.bulk:
+        transformer = BulkTransformer(processor.settings, workers=args.jobs,
+                                      include=tuple(args.include or ('*',)), encoding=args.encoding)
+        try:
+            stats = transformer.run(*args.bulk)
+        except OSError as e:
+            print(f"uwuifier: {e}", file=sys.stderr)
+            return 1
+        print(format_stats(stats))
+        return 1 if stats['errors'] else 0
+
+    output = open(args.output, 'w', encoding=args.encoding, newline='') if args.output else sys.stdout
+    try:
+        if args.text and not (args.file or args.stdin):
+            output.write(processor.process_text(" ".join(args.text)) + "\n")
+        elif args.file:
+            with open(args.file, 'r', encoding=args.encoding, newline='') as source:
+                processor.process_stream(source, output)
+        else:
+            processor.process_stream(sys.stdin, output, line_buffered=True)
+    except KeyboardInterrupt:
+        return 130
+    except (OSError, UnicodeError) as e:
+        print(f"uwuifier: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        processor.shutdown()
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())